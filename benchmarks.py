@@ -0,0 +1,277 @@
+from dataclasses import dataclass, field, asdict, replace
+from tempfile import TemporaryDirectory
+from platform import python_version
+from time import perf_counter, time
+from argparse import ArgumentParser
+from typing import Any, Callable, TypedDict
+from json import loads, dumps
+from shutil import rmtree
+from pathlib import Path
+import tracemalloc
+
+from PIL.Image import new as new_image
+
+from editor_types.data_types import Int, Float, String, Bool, Image, Rarity, CoinValue
+from editor_types.content_types import Item, Material, Sword, Accessory
+from editor_types.rarities import rarities
+from builder.compilers import FakeCompiler
+from project import Project, ModConfig
+from builder import build_project
+
+
+SIZES = [10, 1_000, 50_000]
+results_file = Path.cwd() / 'cache' / 'benchmarks.jsonl'
+
+# how many different textures a synthetic project uses, real mods share a lot of their textures
+TEXTURE_COUNT = 16
+
+def make_textures(folder: Path):
+    folder.mkdir(parents=True, exist_ok=True)
+    textures = []
+    for i in range(TEXTURE_COUNT):
+        path = folder / f'texture_{i}.png'
+        new_image('RGBA', (16 + i * 4, 16 + i * 2), (i * 16, 255 - i * 16, 128, 255)).save(path)
+        textures.append(path.as_posix())
+
+    return textures
+
+class CommonFields(TypedDict):
+    """The fields every content type has, see `Item`."""
+
+    name: String
+    tooltip: String
+    value: CoinValue
+    texture: Image
+    rarity: Rarity
+
+def make_content(i: int, textures: list[str]):
+    """The `i`th item of a synthetic project, cycling through every content type."""
+
+    common: CommonFields = {
+        'name': String(f'Synthetic Item {i}'),
+        'tooltip': String(f'Tooltip of item {i}'),
+        'value': CoinValue(0, i % 10, i % 100, i % 100),
+        'texture': Image(textures[i % len(textures)]),
+        'rarity': Rarity(rarities[i % len(rarities)])
+    }
+
+    match i % 4:
+        case 0:
+            return Item(**common)
+        case 1:
+            return Material(**common, max_stack=Int(999), research_amount=Int(25))
+        case 2:
+            return Sword(
+                **common, damage=Int(10 + i % 90), knockback=Float(i % 10 / 2),
+                crit_chance=Int(i % 20), use_time=Int(15 + i % 10)
+            )
+        case _:
+            return Accessory(
+                **common, movement_speed=Float(i % 15), jump_height=Float(i % 5),
+                no_fall_damage=Bool(i % 2 == 0)
+            )
+
+def make_project(folder: Path, size: int):
+    textures = make_textures(folder / 'textures')
+    content = [make_content(i, textures) for i in range(size)]
+    return Project(f'Synthetic {size}', folder, content, ModConfig(icon=Path(textures[0])))
+
+@dataclass
+class Measurement:
+    seconds: float # fastest of the timed runs
+    peak_bytes: int | None = None # peak traced allocation of one more run, if memory is measured
+
+def measure(
+    run: Callable[[Any], Any], setup: Callable[[], Any] = lambda: None, repeat: int = 1,
+    memory: bool = True
+):
+    """Time `run` over `repeat` runs, calling `setup` before each one outside of the timing and
+passing its result to `run`. The memory is measured on a separate run because tracing
+allocations slows everything down."""
+
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = perf_counter()
+        run(arg)
+        timings.append(perf_counter() - start)
+
+    measurement = Measurement(min(timings))
+    if memory:
+        arg = setup()
+        tracemalloc.start()
+        try:
+            run(arg)
+            measurement.peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return measurement
+
+def bench_project(folder: Path, size: int, repeat: int, memory: bool):
+    project = make_project(folder, size)
+    build_dir = project.path / project.internal_name
+    compiler = FakeCompiler()
+
+    def clean_build():
+        rmtree(build_dir, ignore_errors=True)
+        for leftover in project.path.glob(f'{project.internal_name}.*'):
+            leftover.unlink()
+
+    edits = 0
+    def edit_one():
+        # one field of one item, like a typical save in the editor
+        nonlocal edits
+        edits += 1
+        project.set_content(0, replace(project.content[0], value=CoinValue(edits, 0, 0, 0)))
+
+    def save_as(format: str):
+        def save(_):
+            project.format = format
+            project.save()
+            project.format = 'json'
+
+        return save
+
+    def build(_):
+        if not build_project(project, compiler=compiler).success:
+            raise RuntimeError(f'synthetic project of {size} items failed to build')
+
+    return {
+        'save': measure(lambda _: project.save(), repeat=repeat, memory=memory),
+        'save_one_edit': measure(lambda _: project.save_changes(), edit_one, repeat, memory),
+        'load': measure(lambda _: Project.load(project.file), repeat=repeat, memory=memory),
+        'save_binary': measure(save_as('binary'), repeat=repeat, memory=memory),
+        'load_binary': measure(
+            lambda _: Project.load(project.file.with_suffix('.tmb')), repeat=repeat, memory=memory
+        ),
+        'load_lazy': measure(
+            lambda _: Project.load(project.file, lazy=True), repeat=repeat, memory=memory
+        ),
+        'load_binary_lazy': measure(
+            lambda _: Project.load(project.file.with_suffix('.tmb'), lazy=True), repeat=repeat,
+            memory=memory
+        ),
+        'save_sqlite': measure(save_as('sqlite'), repeat=repeat, memory=memory),
+        'load_sqlite_lazy': measure(
+            lambda _: Project.load(project.file.with_suffix('.tmbdb'), lazy=True), repeat=repeat,
+            memory=memory
+        ),
+        'query_sqlite': measure(
+            lambda sqlite_project: sqlite_project.query('Sword', rarity__rare='Red'),
+            lambda: Project.load(project.file.with_suffix('.tmbdb'), lazy=True), repeat, memory
+        ),
+        'load_content': measure(
+            Project.load_content, lambda: loads(project.file.read_text('utf-8')), repeat, memory
+        ),
+        'build': measure(build, clean_build, repeat, memory),
+        'rebuild_one_edit': measure(build, edit_one, repeat, memory),
+        'rebuild_no_changes': measure(build, repeat=repeat, memory=memory)
+    }
+
+@dataclass
+class BenchmarkRun:
+    label: str
+    python: str = field(default_factory=python_version)
+    started: float = field(default_factory=time)
+    results: dict[str, dict[str, Measurement]] = field(default_factory=dict) # size -> op -> result
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('a', encoding='utf-8') as f:
+            f.write(dumps(asdict(self)) + '\n')
+
+    @staticmethod
+    def load_all(path: Path):
+        if not path.exists():
+            return []
+
+        runs = []
+        for line in path.read_text('utf-8').splitlines():
+            json = loads(line)
+            results = {
+                size: {op: Measurement(**measurement) for op, measurement in ops.items()}
+                for size, ops in json.pop('results').items()
+            }
+            runs.append(BenchmarkRun(**json, results=results))
+
+        return runs
+
+def format_bytes(size: int | None):
+    if size is None:
+        return '-'
+
+    scaled = float(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if scaled < 1024:
+            return f'{scaled:.0f}{unit}'
+
+        scaled /= 1024
+
+    return f'{scaled:.1f}GiB'
+
+def format_change(new: float | None, old: float | None):
+    if not new or not old:
+        return ''
+
+    return f'{(new - old) / old * 100:+.0f}%'
+
+def report(run: BenchmarkRun, baseline: BenchmarkRun | None):
+    lines = []
+    for size, ops in run.results.items():
+        lines.append(f'{size} items')
+        old_ops = baseline.results.get(size, {}) if baseline is not None else {}
+        for op, measurement in ops.items():
+            old = old_ops.get(op)
+            old_seconds = old.seconds if old is not None else None
+            old_bytes = old.peak_bytes if old is not None else None
+            lines.append(
+                f'  {op:<20}{measurement.seconds:>10.4f}s'
+                f'{format_change(measurement.seconds, old_seconds):>8}'
+                f'{format_bytes(measurement.peak_bytes):>12}'
+                f'{format_change(measurement.peak_bytes, old_bytes):>8}'
+            )
+
+    if baseline is not None:
+        lines.append(f'changes are relative to "{baseline.label}"')
+
+    return '\n'.join(lines)
+
+def main(args: list[str]):
+    """Benchmark loading, saving and building synthetic projects. Returns the process exit code."""
+
+    parser = ArgumentParser(prog='main.py bench', description='Benchmark synthetic projects.')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=SIZES,
+                        help='how many content items each synthetic project has')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='timed runs of each operation, the fastest one is kept')
+    parser.add_argument('-l', '--label', default='',
+                        help='name of this run in the results file, e.g. the branch being tested')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip measuring peak memory, which reruns every operation traced')
+    parser.add_argument('-o', '--output', type=Path, default=results_file,
+                        help='results file, every run is appended to it')
+    parser.add_argument('--compare', default=None,
+                        help='label of the stored run to compare against (defaults to the last)')
+    options = parser.parse_args(args)
+
+    previous = BenchmarkRun.load_all(options.output)
+    baseline = previous[-1] if previous else None
+    if options.compare is not None:
+        matching = [run for run in previous if run.label == options.compare]
+        if not matching:
+            parser.error(f'no stored run is labelled "{options.compare}"')
+
+        baseline = matching[-1]
+
+    run = BenchmarkRun(options.label or f'run {len(previous) + 1}')
+    for size in options.sizes:
+        with TemporaryDirectory(prefix='tmb-bench-') as folder:
+            results = bench_project(Path(folder), size, max(1, options.repeat), not options.no_memory)
+
+        run.results[str(size)] = results
+        print(f'benchmarked {size} items', flush=True)
+
+    run.save(options.output)
+    print(report(run, baseline))
+    return 0
@@ -0,0 +1,247 @@
+from struct import Struct, pack, unpack_from
+from json import loads, dumps
+from typing import Any, Callable
+
+
+MAGIC = b'TMBP'
+VERSION = 1
+HEADER = Struct('<4sHI') # magic, version, length of the json header (config, content layouts)
+COUNT = Struct('<I')
+SHAPE_ID = Struct('<H')
+
+# content that is not shaped like `Project.save` writes it is stored as a json string instead
+RAW_SHAPE = 0xFFFF
+
+# struct formats of the leaf values, strings and anything else are indexes into the string table
+KIND_FORMATS = {'b': '?', 'i': 'q', 'f': 'd', 's': 'I', 'j': 'I'}
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def leaf_kind(value: Any):
+    if isinstance(value, bool):
+        return 'b'
+    elif isinstance(value, int):
+        return 'i' if INT64_MIN <= value <= INT64_MAX else 'j'
+    elif isinstance(value, float):
+        return 'f'
+    elif isinstance(value, str):
+        return 's'
+
+    return 'j'
+
+def content_shape(content: Any):
+    """The layout of a content item as saved by `Project.save`: its type, and the type, keys and
+kinds of value of every field. Items with the same shape are packed with the same struct."""
+
+    if not isinstance(content, dict) or not isinstance(content.get('type'), str):
+        return None
+
+    fields = []
+    for name, field_json in content.items():
+        if name == 'type':
+            continue
+        elif not isinstance(field_json, dict) or not isinstance(field_json.get('type'), str):
+            return None
+
+        keys = tuple(key for key in field_json if key != 'type')
+        kinds = ''.join(leaf_kind(field_json[key]) for key in keys)
+        fields.append((name, field_json['type'], keys, kinds))
+
+    return content['type'], tuple(fields)
+
+class StringTable:
+    def __init__(self):
+        self.indexes: dict[str, int] = {}
+
+    def add(self, string: str):
+        index = self.indexes.get(string)
+        if index is None:
+            index = self.indexes[string] = len(self.indexes)
+
+        return index
+
+    def encode(self):
+        encoded = [string.encode('utf-8') for string in self.indexes]
+        lengths = pack(f'<{len(encoded)}I', *map(len, encoded))
+        return COUNT.pack(len(encoded)) + lengths + b''.join(encoded)
+
+    @staticmethod
+    def decode(data: bytes, offset: int):
+        count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        lengths = unpack_from(f'<{count}I', data, offset)
+        offset += count * 4
+
+        strings = []
+        for length in lengths:
+            strings.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        return strings, offset
+
+def shape_struct(shape: tuple):
+    kinds = ''.join(kinds for _, _, _, kinds in shape[1])
+    return Struct('<' + ''.join(KIND_FORMATS[kind] for kind in kinds)), kinds
+
+def encode(json: dict[str, Any]):
+    """Pack a project, in the json form made by `Project.save`, into the binary format."""
+
+    strings = StringTable()
+    shapes: dict[tuple, tuple[int, Struct, str]] = {}
+    records = []
+    for content in json['content']:
+        shape = content_shape(content)
+        if shape is None:
+            records.append(SHAPE_ID.pack(RAW_SHAPE) + COUNT.pack(strings.add(dumps(content))))
+            continue
+
+        if shape not in shapes:
+            if len(shapes) == RAW_SHAPE:
+                raise ValueError(f'projects cannot have more than {RAW_SHAPE} content layouts')
+
+            shapes[shape] = (len(shapes), *shape_struct(shape))
+
+        shape_id, struct, kinds = shapes[shape]
+        values: list[Any] = []
+        for name, _, keys, _ in shape[1]:
+            field_json = content[name]
+            values.extend(field_json[key] for key in keys)
+
+        for i, kind in enumerate(kinds):
+            if kind == 's':
+                values[i] = strings.add(values[i])
+            elif kind == 'j':
+                values[i] = strings.add(dumps(values[i]))
+
+        records.append(SHAPE_ID.pack(shape_id) + struct.pack(*values))
+
+    header = {
+        'project': json | {'content': None}, # kept as a placeholder so the keys stay in order
+        'shapes': [[shape[0], [list(field) for field in shape[1]]] for shape in shapes]
+    }
+    header_bytes = dumps(header, separators=(',', ':')).encode('utf-8')
+    return b''.join([
+        HEADER.pack(MAGIC, VERSION, len(header_bytes)), header_bytes, strings.encode(),
+        COUNT.pack(len(records)), *records
+    ])
+
+def is_binary(data: bytes):
+    return data[:len(MAGIC)] == MAGIC
+
+def json_shape_decoder(content_type: str, fields: list[tuple[str, str, tuple[str, ...], str]]):
+    """Makes the function turning the leaf values of a content layout back into its json."""
+
+    slices = []
+    start = 0
+    for name, typ, keys, _ in fields:
+        slices.append((name, typ, keys, start, start + len(keys)))
+        start += len(keys)
+
+    def decode_values(values: list):
+        item: dict[str, Any] = {'type': content_type}
+        for name, typ, keys, start, end in slices:
+            field_json = {'type': typ}
+            field_json.update(zip(keys, values[start:end]))
+            item[name] = field_json
+
+        return item
+
+    return decode_values
+
+class BinaryReader:
+    """Reads a binary project's header, string table and content layouts, so its content can be
+decoded all at once or one record at a time. The content can be decoded into something other than
+json by passing a `shape_decoder`, which is given each content layout and returns a function
+making an item from that layout's leaf values, along with a `raw_decoder` for the items stored as
+json."""
+
+    def __init__(
+        self, data: bytes,
+        shape_decoder: Callable[[str, list], Callable[[list], Any]] = json_shape_decoder,
+        raw_decoder: Callable[[dict], Any] = lambda json: json
+    ):
+        magic, version, header_length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('not a binary tModBuilder project')
+        elif version > VERSION:
+            raise ValueError(f'binary project version {version} is newer than this tModBuilder')
+
+        offset = HEADER.size
+        header = loads(data[offset:offset + header_length])
+        offset += header_length
+        self.strings, offset = StringTable.decode(data, offset)
+        self.count, = COUNT.unpack_from(data, offset)
+
+        self.data = data
+        self.project: dict[str, Any] = header['project']
+        self.records_offset = offset + COUNT.size
+        self.raw_decoder = raw_decoder
+        self.shapes: list[tuple[str, list]] = []
+        self.decoders = []
+        for content_type, fields in header['shapes']:
+            shape = (content_type, tuple(
+                (name, typ, tuple(keys), kinds) for name, typ, keys, kinds in fields
+            ))
+            struct, kinds = shape_struct(shape)
+            string_indexes = [i for i, kind in enumerate(kinds) if kind == 's']
+            json_indexes = [i for i, kind in enumerate(kinds) if kind == 'j']
+            self.shapes.append((content_type, list(shape[1])))
+            self.decoders.append((
+                struct, string_indexes, json_indexes, shape_decoder(content_type, list(shape[1]))
+            ))
+
+    def read(self, offset: int):
+        """The shape id and leaf values of the record at `offset`, and the offset of the next record.
+Items stored as json have the `RAW_SHAPE` id, and their json as the only value."""
+
+        data = self.data
+        shape_id, = SHAPE_ID.unpack_from(data, offset)
+        offset += SHAPE_ID.size
+        if shape_id == RAW_SHAPE:
+            index, = COUNT.unpack_from(data, offset)
+            return shape_id, [loads(self.strings[index])], offset + COUNT.size
+
+        struct, string_indexes, json_indexes, _ = self.decoders[shape_id]
+        values = list(struct.unpack_from(data, offset))
+        strings = self.strings
+        for i in string_indexes:
+            values[i] = strings[values[i]]
+
+        for i in json_indexes:
+            values[i] = loads(strings[values[i]])
+
+        return shape_id, values, offset + struct.size
+
+    def decode_values(self, shape_id: int, values: list):
+        if shape_id == RAW_SHAPE:
+            return self.raw_decoder(values[0])
+
+        return self.decoders[shape_id][3](values)
+
+    def records(self):
+        """Yield the offset, shape id and leaf values of every record."""
+
+        offset = self.records_offset
+        for _ in range(self.count):
+            shape_id, values, next_offset = self.read(offset)
+            yield offset, shape_id, values
+            offset = next_offset
+
+    def decode(self):
+        json = self.project
+        records = self.records()
+        json['content'] = [self.decode_values(shape_id, values) for _, shape_id, values in records]
+        return json
+
+def decode(
+    data: bytes, shape_decoder: Callable[[str, list], Callable[[list], Any]] = json_shape_decoder,
+    raw_decoder: Callable[[dict], Any] = lambda json: json
+):
+    """Unpack a binary project into the same json `Project.save` would write for it, or into
+something else (see `BinaryReader`)."""
+
+    return BinaryReader(data, shape_decoder, raw_decoder).decode()
+
+def load_json(data: bytes) -> dict[str, Any]:
+    """Parse a project file's contents, whichever format it is in."""
+
+    return decode(data) if is_binary(data) else loads(data)
@@ -0,0 +1,546 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from functools import partial
+from json import loads, dumps
+from time import perf_counter
+from hashlib import sha256
+from pathlib import Path
+from os import cpu_count
+
+from builder.compilers import Compiler, CompileResult, MSBuildCompiler, find_tml_targets, assets_file
+from builder.textures import TextureStats, file_stamp, hash_texture, write_textures
+from builder.csharp import CodeWriter, Method, Property, PropertyFlags
+from builder.localization import Localization, LocalizationFiles
+from builder.report import BuildReport, BuildMonitor, BuildCancelled, StageStats
+from project import Project
+
+
+# bump whenever the generated code or the manifest layout changes so old manifests stop matching
+MANIFEST_VERSION = 5
+
+
+@dataclass
+class BuildManifest:
+    """Records what the last build generated, stored next to the build directory."""
+
+    inputs: str = ''
+    artifacts: dict[str, str] = field(default_factory=dict) # path relative to the build dir -> sha256
+    sources: dict[str, list] = field(default_factory=dict) # copied file -> [size, mtime_ns, sha256]
+    compiled: bool = False
+    compiler: str = '' # name of the compiler that last compiled the build dir
+    restored: str = '' # hash of the .csproj as of the last successful restore
+
+    @staticmethod
+    def load(path: Path):
+        if not path.exists():
+            return BuildManifest()
+
+        try:
+            json = loads(path.read_text('utf-8'))
+        except ValueError:
+            return BuildManifest()
+
+        if json.get('version') != MANIFEST_VERSION:
+            return BuildManifest()
+
+        return BuildManifest(
+            json['inputs'], json['artifacts'], json['sources'], json['compiled'], json['compiler'],
+            json['restored']
+        )
+
+    def save(self, path: Path):
+        path.write_text(dumps({
+            'version': MANIFEST_VERSION,
+            'inputs': self.inputs,
+            'artifacts': self.artifacts,
+            'sources': self.sources,
+            'compiled': self.compiled,
+            'compiler': self.compiler,
+            'restored': self.restored
+        }, indent=4))
+
+    def is_compiled_by(self, compiler: Compiler):
+        return self.compiled and self.compiler == compiler.name
+
+    def is_fresh(self, build_dir: Path, inputs: str, compiler: Compiler):
+        """Whether the last build compiled these exact inputs with this compiler and none of its files
+have changed since."""
+
+        if not self.is_compiled_by(compiler) or self.inputs != inputs:
+            return False
+
+        for source, known in self.sources.items():
+            source_path = Path(source)
+            if not source_path.exists() or file_stamp(source_path) != known[:2]:
+                return False
+
+        return all((build_dir / artifact).exists() for artifact in self.artifacts)
+
+@dataclass
+class StagedFiles:
+    """What a `BuildOutput` staged, without the last build's manifest, so the results content workers
+send back stay the size of their item."""
+
+    staged: dict[str, list[str] | Path]
+    artifacts: dict[str, str]
+    sources: dict[str, list]
+    sizes: dict[str, int]
+    pending: dict[str, None]
+
+@dataclass
+class BuildOutput:
+    """Collects every file a build generates and only writes the ones whose contents changed."""
+
+    build_dir: Path
+    previous: BuildManifest = field(default_factory=BuildManifest)
+    manifest: BuildManifest = field(default_factory=BuildManifest)
+    staged: dict[str, list[str] | Path] = field(default_factory=dict) # file contents or file to copy
+    sizes: dict[str, int] = field(default_factory=dict)
+    pending: dict[str, None] = field(default_factory=dict) # staged since the last commit, in order
+    touched: list[str] = field(default_factory=list) # written or removed so far
+    textures: TextureStats = field(default_factory=TextureStats)
+
+    def relative(self, path: Path):
+        return path.relative_to(self.build_dir).as_posix()
+
+    def stage(self, artifact: str, data: list[str] | Path, digest: str, size: int):
+        self.staged[artifact] = data
+        self.manifest.artifacts[artifact] = digest
+        self.sizes[artifact] = size
+        self.pending[artifact] = None
+
+    def write_lines(self, path: Path, lines: list[str]):
+        digest = sha256()
+        size = 0
+        for line in lines:
+            data = line.encode('utf-8')
+            digest.update(data)
+            size += len(data)
+
+        self.stage(self.relative(path), lines, digest.hexdigest(), size)
+
+    def write_text(self, path: Path, text: str):
+        self.write_lines(path, [text])
+
+    def copy_file(self, src: Path | str, dst: Path):
+        src = Path(src)
+        source = src.as_posix()
+        stamp = file_stamp(src)
+
+        # only hash the source again if it changed since the last build
+        known = self.previous.sources.get(source)
+        digest = known[2] if known is not None and known[:2] == stamp else hash_texture(src, stamp)
+
+        self.stage(self.relative(dst), src, digest, stamp[0])
+        self.manifest.sources[source] = stamp + [digest]
+
+    def staged_files(self):
+        return StagedFiles(
+            self.staged, self.manifest.artifacts, self.manifest.sources, self.sizes, self.pending
+        )
+
+    def merge(self, other: StagedFiles):
+        """Add everything staged in `other`, later writes to the same path replacing earlier ones."""
+
+        self.staged.update(other.staged)
+        self.manifest.artifacts.update(other.artifacts)
+        self.manifest.sources.update(other.sources)
+        self.sizes.update(other.sizes)
+        self.pending.update(other.pending)
+
+    def take_pending(self, kind: type):
+        """Remove the pending artifacts of this kind (`list` for files, `Path` for copies) and return
+the ones that differ from the last build."""
+
+        taken = [artifact for artifact in self.pending if isinstance(self.staged[artifact], kind)]
+        changed = []
+        for artifact in taken:
+            del self.pending[artifact]
+            path = self.build_dir / artifact
+            unchanged = self.previous.artifacts.get(artifact) == self.manifest.artifacts[artifact]
+            if not unchanged or not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                changed.append(artifact)
+
+        self.touched.extend(changed)
+        return changed
+
+    def write_artifact(self, artifact: str):
+        lines = self.staged[artifact]
+        assert isinstance(lines, list)
+        with (self.build_dir / artifact).open('w', encoding='utf-8', newline='') as f:
+            f.writelines(lines)
+
+    def commit(self, jobs: int = 1):
+        """Write the files staged since the last commit that differ from the last build, using `jobs`
+threads. Copies are left for `commit_textures`. Returns the written paths."""
+
+        files = self.take_pending(list)
+        if jobs == 1 or len(files) < 2:
+            for artifact in files:
+                self.write_artifact(artifact)
+        else:
+            with ThreadPoolExecutor(jobs) as pool:
+                # list() so the first failed write is raised here
+                list(pool.map(self.write_artifact, files))
+
+        return files
+
+    def commit_textures(self, jobs: int = 1):
+        textures = self.take_pending(Path)
+        self.textures = write_textures(self, textures, jobs)
+        return textures
+
+    def partial_manifest(self):
+        """The manifest of a build that stopped partway, made from the last build's with the files
+written or removed since left out, so the next build neither skips compiling nor trusts them."""
+
+        touched = set(self.touched)
+        return BuildManifest(
+            artifacts={
+                artifact: digest for artifact, digest in self.previous.artifacts.items()
+                if artifact not in touched
+            },
+            sources=self.previous.sources, restored=self.previous.restored
+        )
+
+    def remove_stale(self):
+        """Delete the files the last build made that are no longer generated."""
+
+        stale = sorted(self.previous.artifacts.keys() - self.manifest.artifacts.keys())
+        for artifact in stale:
+            (self.build_dir / artifact).unlink(missing_ok=True)
+
+        self.touched.extend(stale)
+        return stale
+
+@dataclass
+class BuildContext:
+    mod_name: str
+    build_dir: Path
+    project: Project
+    class_name: str
+    output: BuildOutput
+    class_bases: list[str] = field(default_factory=list)
+    class_properties: list[Property] = field(default_factory=list)
+    class_methods: list[Method] = field(default_factory=list)
+    # kept in sync by `add_property` and `add_method`, methods are listed with all their overloads
+    properties_by_name: dict[str, Property] = field(default_factory=dict, init=False, repr=False)
+    methods_by_name: dict[str, list[Method]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        properties, self.class_properties = self.class_properties, []
+        methods, self.class_methods = self.class_methods, []
+        for prop in properties:
+            self.add_property(prop)
+
+        for method in methods:
+            self.add_method(method)
+
+    def add_property(self, prop: Property):
+        if prop.name in self.properties_by_name or prop.name in self.methods_by_name:
+            raise ValueError(f'{self.class_name} already has a member named {prop.name}')
+
+        self.properties_by_name[prop.name] = prop
+        self.class_properties.append(prop)
+
+    def add_method(self, method: Method):
+        if method.name in self.properties_by_name:
+            raise ValueError(f'{self.class_name} already has a member named {method.name}')
+
+        overloads = self.methods_by_name.setdefault(method.name, [])
+        param_types = [param[0] for param in method.params]
+        if any([param[0] for param in overload.params] == param_types for overload in overloads):
+            raise ValueError(
+                f'{self.class_name} already has a method {method.name}({", ".join(param_types)})'
+            )
+
+        overloads.append(method)
+        self.class_methods.append(method)
+
+    def write_class(self, writer: CodeWriter):
+        class_bases_str = ', '.join(self.class_bases)
+        with writer.block(f'public class {self.class_name} : {class_bases_str}'):
+            for prop in self.class_properties:
+                prop.write(writer)
+
+            for i, method in enumerate(self.class_methods):
+                if i > 0 or self.class_properties:
+                    writer.line()
+
+                method.write(writer)
+
+    def find_method(self, name: str):
+        overloads = self.methods_by_name.get(name)
+        if overloads:
+            return overloads[0]
+
+
+assets_folder = Path.cwd() / 'assets'
+
+def hash_inputs(project: Project):
+    """Hash everything a build is generated from, apart from the files it copies."""
+
+    digest = sha256(
+        f'{MANIFEST_VERSION}\n{assets_folder}\n{project.name}\n{project.config!r}\n'.encode()
+    )
+    for content in project.content:
+        digest.update(repr(content).encode())
+
+    return digest.hexdigest()
+
+def make_build_files(output: BuildOutput, mod_name: str):
+    launch_settings_json = output.build_dir / 'Properties' / 'launchSettings.json'
+    output.write_text(launch_settings_json, """{
+    "profiles": {
+        "Terraria": {
+            "commandName": "Executable",
+            "executablePath": "$(DotNetName)",
+            "commandLineArgs": "$(tMLPath)",
+            "workingDirectory": "$(tMLSteamPath)"
+        },
+        "TerrariaServer": {
+          "commandName": "Executable",
+          "executablePath": "$(DotNetName)",
+          "commandLineArgs": "$(tMLServerPath)",
+          "workingDirectory": "$(tMLSteamPath)"
+        }
+    }
+}""")
+    
+    tmodloader_targets = find_tml_targets() or assets_folder / 'tModLoader.targets'
+    
+    # manually add in a .csproj template
+    csproj = output.build_dir / f'{mod_name}.csproj'
+    output.write_text(csproj, f"""<Project Sdk="Microsoft.NET.Sdk">
+  <Import Project="{tmodloader_targets.as_posix()}" />
+  <PropertyGroup>
+    <AssemblyName>{mod_name}</AssemblyName>
+    <LangVersion>latest</LangVersion>
+  </PropertyGroup>
+  <ItemGroup>
+  </ItemGroup>
+</Project>
+""")
+    
+    return csproj
+
+def compile_project(
+    compiler: Compiler, output: BuildOutput, csproj: Path, monitor: BuildMonitor | None = None
+):
+    """Compile the build dir, skipping the restore when the .csproj has not changed since the last
+successful one and its packages are still restored, and record the outcome in the manifest."""
+
+    manifest = output.manifest
+    manifest.compiler = compiler.name
+    error = compiler.check()
+    if error is not None:
+        manifest.compiled = False
+        return CompileResult(False, [error])
+
+    csproj_hash = manifest.artifacts[output.relative(csproj)]
+    restore = manifest.restored != csproj_hash or not assets_file(csproj).exists()
+
+    result = compiler.compile(csproj, restore, monitor)
+    manifest.compiled = result.success
+    # a failed compile may be down to a broken restore, so the next one restores again
+    manifest.restored = csproj_hash if result.success else ''
+
+    return result
+
+def content_sources(previous: BuildManifest, content):
+    """The last build's stamps of the images `content` uses, all of the manifest its worker needs."""
+
+    from editor_types.data_types import Image
+
+    images = [value for value in vars(content).values() if isinstance(value, Image)]
+    paths = [Path(image.path).as_posix() for image in images]
+    return {path: previous.sources[path] for path in paths if path in previous.sources}
+
+def build_content(
+    mod_name: str, build_dir: Path, project: Project, content, sources: dict[str, list]
+):
+    """Generate a single content item, given the last build's stamps of its images (see
+`content_sources`). This runs on a worker so it must not touch anything shared with the other items.
+Returns the item's localizations, the files it staged and how long it took to generate."""
+
+    start = perf_counter()
+    output = BuildOutput(build_dir, BuildManifest(sources=sources))
+    build_ctx = BuildContext(mod_name, build_dir, project, content.get_internal_name(), output)
+    content.build(build_ctx)
+    localizations = content.build_localizations(build_ctx, project.config.languages)
+
+    writer = CodeWriter()
+    for namespace in ('Terraria', 'Terraria.ID', 'Terraria.ModLoader', 'Terraria.Localization'):
+        writer.line(f'using {namespace};')
+
+    writer.line()
+    with writer.block(f'namespace {mod_name}.Content'):
+        build_ctx.write_class(writer)
+
+    content_path = build_dir / 'Content' / f'{content.get_internal_name()}.cs'
+    output.write_lines(content_path, writer.lines)
+
+    return localizations, output.staged_files(), perf_counter() - start
+
+def map_content(
+    project: Project, mod_name: str, build_dir: Path, previous: BuildManifest, jobs: int,
+    processes: bool
+):
+    """Run `build_content` over every content item, yielding the results in project order."""
+
+    build = partial(build_content, mod_name, build_dir, project)
+    sources = (content_sources(previous, content) for content in project.content)
+    if jobs == 1 or len(project.content) < 2:
+        yield from map(build, project.content, sources)
+        return
+
+    if processes:
+        # every task pickles the whole project, so hand each worker a few large batches instead
+        chunksize = max(1, len(project.content) // (jobs * 4))
+        with ProcessPoolExecutor(jobs) as pool:
+            yield from pool.map(build, project.content, sources, chunksize=chunksize)
+    else:
+        with ThreadPoolExecutor(jobs) as pool:
+            yield from pool.map(build, project.content, sources)
+
+def record_writes(stats: StageStats, output: BuildOutput, artifacts: list[str]):
+    stats.files_touched += len(artifacts)
+    stats.bytes_written += sum(output.sizes.get(artifact, 0) for artifact in artifacts)
+
+def build_project(
+    project: Project, jobs: int | None = None, processes: bool = False,
+    compiler: Compiler | None = None, monitor: BuildMonitor | None = None
+):
+    """Build the project into a tModLoader mod. Content items are generated on a pool of `jobs`
+workers (threads, or processes if `processes` is set), defaulting to one per CPU. Pass the same
+`compiler` to every build to reuse it, it defaults to a plain `MSBuildCompiler`. A `monitor` is
+told about each stage and every line of compiler output, and can cancel the build.
+Returns a `BuildReport`, which is also saved as JSON next to the build dir."""
+
+    start = perf_counter()
+    jobs = jobs or cpu_count() or 1
+    compiler = compiler or MSBuildCompiler()
+    monitor = monitor or BuildMonitor()
+    project.materialize_all()
+    mod_name = project.internal_name
+    report = BuildReport(project.name, compiler.name)
+    report_path = project.path / f'{mod_name}.report.json'
+    try:
+        run_build(project, jobs, processes, compiler, monitor, report)
+    except BuildCancelled:
+        # the files written so far are left out of the saved manifest, see `partial_manifest`
+        report.success = False
+        report.cancelled = True
+
+    report.seconds = perf_counter() - start
+    report.save(report_path)
+    return report
+
+def run_build(
+    project: Project, jobs: int, processes: bool, compiler: Compiler, monitor: BuildMonitor,
+    report: BuildReport
+):
+    mod_name = project.internal_name
+    build_dir = project.path / mod_name
+    manifest_path = project.path / f'{mod_name}.manifest'
+
+    @contextmanager
+    def stage(name: str):
+        monitor.check()
+        monitor.progress(name)
+        with report.stage(name) as stats:
+            yield stats
+
+    with stage('check'):
+        previous = BuildManifest.load(manifest_path)
+        inputs = hash_inputs(project)
+        report.up_to_date = previous.is_fresh(build_dir, inputs, compiler)
+
+    if report.up_to_date:
+        report.success = True
+        return
+
+    output = BuildOutput(build_dir, previous, BuildManifest(inputs, restored=previous.restored))
+    try:
+        with stage('scaffolding') as stats:
+            build_dir.mkdir(exist_ok=True)
+            main = build_dir / f'{mod_name}.cs'
+            output.write_text(main, f"""using Terraria.ModLoader;
+
+namespace {mod_name}
+{{
+    public class {mod_name} : Mod
+    {{
+    }}
+}}
+""")
+        
+            description_txt = build_dir / 'description.txt'
+            output.write_text(description_txt, project.config.description)
+
+            buildIgnore_str = ', '.join(project.config.buildIgnore)
+
+            build_txt = build_dir / 'build.txt'
+            output.write_text(build_txt, f"""author = {project.config.author}
+displayName = {project.name}
+hideCode = {project.config.hideCode}
+hideResources = {project.config.hideResources}
+includeSource = {project.config.includeSource}
+buildIgnore = {buildIgnore_str}
+version = {project.config.version}
+""")
+        
+            csproj = make_build_files(output, mod_name)
+        
+            icon_path = project.config.icon
+            if not icon_path.exists():
+                raise FileNotFoundError(f'Icon file not found: {icon_path}')
+
+            output.copy_file(icon_path, build_dir / 'icon.png')
+            record_writes(stats, output, output.commit(jobs))
+
+        localization_files = LocalizationFiles(project.config.languages)
+        with stage('codegen') as stats:
+            content_outputs = map_content(project, mod_name, build_dir, previous, jobs, processes)
+            for content, result in zip(project.content, content_outputs):
+                monitor.check()
+                localizations, staged, seconds = result
+                report.add_content(content.__class__.__name__, seconds)
+                localization_files.add(localizations)
+                output.merge(staged)
+
+            record_writes(stats, output, output.commit(jobs))
+
+        with stage('localization') as stats:
+            localization_files.write(output, mod_name)
+            record_writes(stats, output, output.commit(jobs))
+
+        with stage('textures') as stats:
+            record_writes(stats, output, output.commit_textures(jobs))
+            report.textures = output.textures
+            output.remove_stale()
+
+        # nothing on disk changed since the last successful compile, so msbuild has nothing to do
+        if not output.touched and previous.is_compiled_by(compiler):
+            output.manifest.compiled = True
+            output.manifest.compiler = compiler.name
+            report.success = True
+        else:
+            monitor.check()
+            monitor.progress('compile')
+            result = compile_project(compiler, output, csproj, monitor)
+            for name, seconds in result.stages.items():
+                report.stages.setdefault(name, StageStats()).seconds += seconds
+
+            report.success = result.success
+            report.compiler_output = result.output
+            monitor.check()
+    except BaseException:
+        if output.touched:
+            output.partial_manifest().save(manifest_path)
+
+        raise
+
+    output.manifest.save(manifest_path)
@@ -0,0 +1,248 @@
+from subprocess import Popen, PIPE, STDOUT, run, DEVNULL
+from dataclasses import dataclass, field
+from time import perf_counter, sleep
+from abc import ABC, abstractmethod
+from re import search, compile
+from threading import Thread
+from hashlib import sha256
+from shutil import which
+from pathlib import Path
+from os import environ
+
+from builder.report import BuildMonitor
+
+
+@dataclass
+class CompileResult:
+    success: bool
+    output: list[str] = field(default_factory=list)
+    stages: dict[str, float] = field(default_factory=dict) # seconds spent restoring, compiling, etc.
+
+# how msbuild and the C# compiler print errors, e.g. `Sword.cs(12,5): error CS1002: ; expected`
+ERROR_PATTERN = compile(
+    r'^\s*(?:(?P<file>.+?)\((?P<line>\d+),(?P<column>\d+)\)|(?P<tool>[^:]+))\s*:\s*'
+    r'error (?P<code>\w+)\s*:\s*(?P<message>.*?)(?:\s+\[[^\]]*\])?$'
+)
+
+@dataclass
+class CompileError:
+    message: str
+    code: str = ''
+    file: Path | None = None # the source file, when the error points into one
+    line: int = 0
+    column: int = 0
+
+    def __str__(self):
+        if self.file is None:
+            return f'error {self.code}: {self.message}'
+
+        return f'{self.file.name}({self.line},{self.column}): error {self.code}: {self.message}'
+
+def parse_errors(output: list[str]):
+    """The errors in a compiler's output, in the order they were printed, without repeats (msbuild
+prints each one again in its summary)."""
+
+    errors = []
+    seen = set()
+    for line in output:
+        match = ERROR_PATTERN.match(line)
+        if match is None or line in seen:
+            continue
+
+        seen.add(line)
+        file = match['file']
+        errors.append(CompileError(
+            match['message'], match['code'], Path(file) if file is not None else None,
+            int(match['line'] or 0), int(match['column'] or 0)
+        ))
+
+    return errors
+
+def assets_file(csproj: Path):
+    """The file a restore writes the resolved packages to, which every compile needs."""
+
+    return csproj.parent / 'obj' / 'project.assets.json'
+
+def find_tml_targets():
+    """Find tModLoader's `tMLMod.targets`, checking the `TMODLOADER_PATH` environment variable before
+the default Steam library on each platform."""
+
+    install_dirs = [
+        Path('C:/Program Files (x86)/Steam/steamapps/common/tModLoader'),
+        Path.home() / '.local' / 'share' / 'Steam' / 'steamapps' / 'common' / 'tModLoader',
+        Path.home() / '.steam' / 'steam' / 'steamapps' / 'common' / 'tModLoader',
+        Path.home() / 'Library' / 'Application Support' / 'Steam/steamapps/common/tModLoader'
+    ]
+    if 'TMODLOADER_PATH' in environ:
+        install_dirs.insert(0, Path(environ['TMODLOADER_PATH']))
+
+    for install_dir in install_dirs:
+        targets = install_dir / 'tMLMod.targets'
+        if targets.exists():
+            return targets
+
+class Compiler(ABC):
+    name = ''
+
+    @abstractmethod
+    def check(self) -> str | None:
+        """Return why this compiler cannot be used on this machine, or `None` if it can."""
+
+    @abstractmethod
+    def compile(
+        self, csproj: Path, restore: bool, monitor: BuildMonitor | None = None
+    ) -> CompileResult:
+        """Compile the mod. `restore` is only set when the .csproj changed since the last successful
+restore, so packages can be restored in the same pass. Output is passed to `monitor.log` as it is
+printed, and the compile stops early if the monitor is cancelled."""
+
+    def close(self):
+        """Shut down anything kept running between builds."""
+
+class MSBuildCompiler(Compiler):
+    """Runs a fresh `dotnet msbuild` for the restore and for the build."""
+
+    name = 'msbuild'
+
+    def msbuild_args(self, csproj: Path) -> list[str]:
+        return ['dotnet', 'msbuild', csproj.as_posix()]
+
+    def msbuild_env(self):
+        return None
+
+    def run(self, args: list[str], stage: str, monitor: BuildMonitor | None = None):
+        monitor = monitor or BuildMonitor()
+        start = perf_counter()
+        output = []
+        with Popen(args, stdout=PIPE, stderr=STDOUT, text=True, env=self.msbuild_env()) as process:
+            Thread(target=self.watch, args=(process, monitor), daemon=True).start()
+            assert process.stdout is not None
+            for line in process.stdout:
+                output.append(line.rstrip())
+                monitor.log(output[-1])
+
+        return CompileResult(process.returncode == 0, output, {stage: perf_counter() - start})
+
+    @staticmethod
+    def watch(process: Popen, monitor: BuildMonitor):
+        """Kill `process` if the build is cancelled before it exits."""
+
+        while process.poll() is None:
+            if monitor.cancelled.wait(0.1):
+                process.kill()
+                return
+
+    def check(self):
+        if which('dotnet') is None:
+            return 'dotnet was not found, install the .NET SDK to build mods.'
+        elif find_tml_targets() is None:
+            return 'tModLoader was not found, set TMODLOADER_PATH to its install folder.'
+
+    def compile(self, csproj, restore, monitor=None):
+        if not restore:
+            return self.run(self.msbuild_args(csproj) + ['-t:build'], 'compile', monitor)
+
+        restored = self.run(self.msbuild_args(csproj) + ['-restore'], 'restore', monitor)
+        if not restored.success:
+            return restored
+
+        result = self.run(self.msbuild_args(csproj) + ['-t:build'], 'compile', monitor)
+        result.output[:0] = restored.output
+        result.stages = restored.stages | result.stages
+        return result
+
+class BuildServerCompiler(MSBuildCompiler):
+    """Keeps MSBuild warm between builds: the MSBuild server, its worker nodes and the Roslyn compiler
+server stay alive after each build and are reused by the next one, and the restore is folded into
+the build so each build is a single msbuild run."""
+
+    name = 'server'
+
+    def __init__(self):
+        self.started = False
+
+    def msbuild_args(self, csproj):
+        return super().msbuild_args(csproj) + ['-nodeReuse:true', '-p:UseSharedCompilation=true']
+
+    def msbuild_env(self):
+        return environ | {'MSBUILDUSESERVER': '1', 'DOTNET_CLI_TELEMETRY_OPTOUT': '1'}
+
+    def compile(self, csproj, restore, monitor=None):
+        self.started = True
+        args = self.msbuild_args(csproj) + ['-t:build']
+        if restore:
+            args.append('-restore')
+
+        # the restore happens inside the same run, so its time is counted as compiling
+        return self.run(args, 'compile', monitor)
+
+    def close(self):
+        if self.started and which('dotnet') is not None:
+            run(['dotnet', 'build-server', 'shutdown'], stdout=DEVNULL, stderr=DEVNULL)
+            self.started = False
+
+class FakeCompiler(Compiler):
+    """Stands in for msbuild so builds can run without .NET or tModLoader installed. It checks that
+every generated .cs file has balanced braces and writes an assembly made from the hash of the
+sources, so the same sources always produce the same output. `delay` adds that many seconds per
+source file to mimic a real compile."""
+
+    name = 'fake'
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def check(self):
+        return None
+
+    def compile(self, csproj, restore, monitor=None):
+        monitor = monitor or BuildMonitor()
+        build_dir = csproj.parent
+        assembly_name = search(r'<AssemblyName>(.*)</AssemblyName>', csproj.read_text('utf-8'))
+        if assembly_name is None:
+            return CompileResult(False, [f'{csproj.as_posix()}: error FAKE001: no AssemblyName'])
+
+        start = perf_counter()
+        output = []
+        if restore:
+            assets = assets_file(csproj)
+            assets.parent.mkdir(parents=True, exist_ok=True)
+            assets.write_text('{}')
+            output.append(f'Restored {csproj.as_posix()}')
+            monitor.log(output[-1])
+
+        digest = sha256()
+        success = True
+        for source in sorted(build_dir.rglob('*.cs')):
+            if 'obj' in source.relative_to(build_dir).parts:
+                continue
+            elif monitor.cancelled.is_set():
+                return CompileResult(False, output, {'compile': perf_counter() - start})
+
+            code = source.read_text('utf-8')
+            if code.count('{') != code.count('}'):
+                output.append(f'{source.as_posix()}(1,1): error FAKE002: unbalanced braces')
+                monitor.log(output[-1])
+                success = False
+
+            digest.update(source.relative_to(build_dir).as_posix().encode())
+            digest.update(code.encode())
+            sleep(self.delay)
+
+        stages = {'compile': perf_counter() - start}
+        if not success:
+            return CompileResult(False, output, stages)
+
+        start = perf_counter()
+        assembly = build_dir / 'obj' / 'fake' / f'{assembly_name.group(1)}.dll'
+        assembly.parent.mkdir(parents=True, exist_ok=True)
+        assembly.write_text(digest.hexdigest())
+        output.append(f'{assembly_name.group(1)} -> {assembly.as_posix()}')
+        monitor.log(output[-1])
+        stages['packaging'] = perf_counter() - start
+        return CompileResult(True, output, stages)
+
+
+COMPILERS: dict[str, type[Compiler]] = {
+    'msbuild': MSBuildCompiler, 'server': BuildServerCompiler, 'fake': FakeCompiler
+}
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+
+
+class CodeWriter:
+    """Builds C# source as a list of indented lines, which are only written to a file once the whole
+file has been generated."""
+
+    def __init__(self, indent: str = '    '):
+        self.lines: list[str] = []
+        self.indent = indent
+        self.level = 0
+
+    def line(self, code: str = ''):
+        self.lines.append(f'{self.indent * self.level}{code}\n' if code else '\n')
+
+    @contextmanager
+    def block(self, header: str):
+        self.line(header)
+        self.line('{')
+        self.level += 1
+        yield
+        self.level -= 1
+        self.line('}')
+
+@dataclass
+class Method:
+    name: str
+    params: list[tuple[str, str]] # (type, name)
+    return_type: str
+    body: list[str] = field(default_factory=list) # one statement per line, '' for a blank line
+
+    def add(self, *statements: str):
+        self.body.extend(statements)
+
+    def write(self, writer: CodeWriter):
+        params_str = ', '.join(f'{param[0]} {param[1]}' for param in self.params)
+        with writer.block(f'public override {self.return_type} {self.name}({params_str})'):
+            for statement in self.body:
+                writer.line(statement)
+
+@dataclass
+class PropertyFlags:
+    override: bool = False
+    static: bool = False
+    readonly: bool = False
+
+    def __str__(self) -> str:
+        code = ''
+        if self.override:
+            code += 'override '
+
+        if self.static:
+            code += 'static '
+
+        if self.readonly:
+            code += 'readonly '
+
+        return code
+
+@dataclass
+class Property:
+    name: str
+    type: str
+    value: str
+    is_field: bool = True
+    flags: PropertyFlags = field(default_factory=PropertyFlags)
+
+    def write(self, writer: CodeWriter):
+        assign_symbol = '=' if self.is_field else '=>'
+        writer.line(f'public {self.flags}{self.type} {self.name} {assign_symbol} {self.value};')
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TextIO
+from io import StringIO
+
+if TYPE_CHECKING:
+    from builder import BuildOutput
+
+
+@dataclass
+class Localization:
+    name: str
+    keys: dict[str, str] = field(default_factory=dict)
+
+    def write(self, stream: TextIO):
+        stream.write(f'{self.name}: {{\n')
+        for key, value in self.keys.items():
+            stream.write(f'    {key}: {value}\n')
+
+        stream.write('}\n')
+
+class LocalizationFiles:
+    """Collects the localization of every content item into one buffer per language, so each
+language's .hjson file is written once per build."""
+
+    def __init__(self, languages: list[str]):
+        self.buffers = {language: StringIO() for language in languages}
+
+    def add(self, localizations: dict[str, Localization]):
+        for language, localization in localizations.items():
+            localization.write(self.buffers.setdefault(language, StringIO()))
+
+    def write(self, output: 'BuildOutput', mod_name: str):
+        localization_dir = output.build_dir / 'Localization'
+        for language, buffer in self.buffers.items():
+            localization_file = localization_dir / f'{language}_Mods.{mod_name}.hjson'
+            output.write_text(localization_file, buffer.getvalue())
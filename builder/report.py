@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field, asdict
+from contextlib import contextmanager
+from time import perf_counter, time
+from typing import Callable
+from threading import Event
+from pathlib import Path
+from json import dumps
+
+from builder.textures import TextureStats
+
+
+class BuildCancelled(Exception):
+    """Raised inside a build once its `BuildMonitor` is cancelled."""
+
+@dataclass
+class BuildMonitor:
+    """Lets a build running on another thread be followed and stopped. `progress` is called with
+the name of each stage as it starts, and `log` with each line the compiler prints as it is printed.
+Both are called on the thread running the build."""
+
+    log: Callable[[str], None] = lambda line: None
+    progress: Callable[[str], None] = lambda stage: None
+    cancelled: Event = field(default_factory=Event)
+
+    def cancel(self):
+        """Stop the build at the next item or stage, killing the compiler if it is running."""
+
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise BuildCancelled()
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    files_touched: int = 0
+    bytes_written: int = 0
+
+@dataclass
+class ContentTypeStats:
+    count: int = 0
+    seconds: float = 0.0
+
+@dataclass
+class BuildReport:
+    """What a build did and where its time went, saved as JSON next to the build directory."""
+
+    project: str
+    compiler: str
+    success: bool = False
+    up_to_date: bool = False # nothing changed since the last successful build, so nothing ran
+    cancelled: bool = False
+    started: float = field(default_factory=time)
+    seconds: float = 0.0
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    content_types: dict[str, ContentTypeStats] = field(default_factory=dict)
+    textures: TextureStats = field(default_factory=TextureStats)
+    compiler_output: list[str] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str):
+        stats = self.stages.setdefault(name, StageStats())
+        start = perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += perf_counter() - start
+
+    def add_content(self, type_name: str, seconds: float):
+        stats = self.content_types.setdefault(type_name, ContentTypeStats())
+        stats.count += 1
+        stats.seconds += seconds
+
+    def save(self, path: Path):
+        path.write_text(dumps(asdict(self), indent=4))
+
+    def summary(self):
+        if self.cancelled:
+            status = 'cancelled'
+        else:
+            status = 'up to date' if self.up_to_date else 'built' if self.success else 'failed'
+        lines = [
+            f'{self.project}: {status} in {self.seconds:.3f}s ({self.compiler})',
+            f'  {"stage":<16}{"seconds":>10}{"files":>8}{"bytes":>14}'
+        ]
+        for name, stage in self.stages.items():
+            lines.append(
+                f'  {name:<16}{stage.seconds:>10.3f}{stage.files_touched:>8}'
+                f'{stage.bytes_written:>14,}'
+            )
+
+        if self.content_types:
+            lines.append(f'  {"content type":<16}{"count":>10}{"seconds":>8}{"ms each":>14}')
+
+        slowest_first = sorted(self.content_types.items(), key=lambda item: -item[1].seconds)
+        for name, content_type in slowest_first:
+            each = content_type.seconds / content_type.count * 1000
+            lines.append(
+                f'  {name:<16}{content_type.count:>10}{content_type.seconds:>8.3f}{each:>14.3f}'
+            )
+
+        textures = self.textures
+        lines.append(
+            f'  textures: {textures.copied} copied, {textures.linked} linked, '
+            f'{textures.skipped} unchanged, {textures.deduplicated_bytes:,} bytes deduplicated'
+        )
+        return '\n'.join(lines)
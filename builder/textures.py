@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from hashlib import file_digest
+from shutil import copyfile
+from pathlib import Path
+from os import link
+
+if TYPE_CHECKING:
+    from builder import BuildOutput
+
+
+# linux's FICLONE ioctl, which makes the destination share the source's blocks on btrfs, XFS, etc.
+FICLONE = 0x40049409
+
+# content hashes of source images by (path, size, mtime_ns), shared by every build in this process
+texture_hashes: dict[tuple[str, int, int], str] = {}
+
+def file_stamp(path: Path):
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+def hash_texture(path: Path, stamp: list[int]):
+    key = (path.as_posix(), stamp[0], stamp[1])
+    digest = texture_hashes.get(key)
+    if digest is None:
+        with path.open('rb') as f:
+            digest = file_digest(f, 'sha256').hexdigest()
+
+        texture_hashes[key] = digest
+
+    return digest
+
+def reflink(src: Path, dst: Path):
+    try:
+        from fcntl import ioctl
+    except ImportError:
+        return False
+
+    with src.open('rb') as src_file, dst.open('wb') as dst_file:
+        try:
+            ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            return True
+        except OSError:
+            pass
+
+    dst.unlink()
+    return False
+
+def hardlink(src: Path, dst: Path):
+    try:
+        link(src, dst)
+        return True
+    except OSError:
+        return False
+
+@dataclass
+class TextureStats:
+    copied: int = 0
+    linked: int = 0
+    skipped: int = 0
+    deduplicated_bytes: int = 0
+
+    def add(self, other: 'TextureStats'):
+        self.copied += other.copied
+        self.linked += other.linked
+        self.skipped += other.skipped
+        self.deduplicated_bytes += other.deduplicated_bytes
+
+def place_texture_group(src: Path, dsts: list[Path], existing: Path | None):
+    """Put one texture at every destination in `dsts`. The first copy is reflinked from `src` where
+the filesystem allows, otherwise copied, and the rest are hardlinked to it (or to `existing`, a
+destination that already holds this texture)."""
+
+    stats = TextureStats()
+    for dst in dsts:
+        # never write through a hardlink, that would change every other file sharing it
+        dst.unlink(missing_ok=True)
+        if existing is not None and hardlink(existing, dst):
+            stats.linked += 1
+            stats.deduplicated_bytes += dst.stat().st_size
+            continue
+
+        if reflink(src, dst):
+            stats.linked += 1
+            stats.deduplicated_bytes += dst.stat().st_size
+        else:
+            copyfile(src, dst)
+            stats.copied += 1
+
+        existing = dst
+
+    return stats
+
+def write_textures(output: 'BuildOutput', artifacts: list[str], jobs: int = 1):
+    """Write the staged texture copies in `artifacts`. Destinations are grouped by content hash so
+identical textures are only stored once."""
+
+    stats = TextureStats()
+    existing: dict[str, Path] = {}
+    writing = set(artifacts)
+    for artifact, data in output.staged.items():
+        if isinstance(data, Path) and artifact not in writing:
+            existing.setdefault(output.manifest.artifacts[artifact], output.build_dir / artifact)
+            stats.skipped += 1
+
+    groups: dict[str, tuple[Path, list[Path]]] = {}
+    for artifact in artifacts:
+        src = output.staged[artifact]
+        assert isinstance(src, Path)
+        digest = output.manifest.artifacts[artifact]
+        groups.setdefault(digest, (src, []))[1].append(output.build_dir / artifact)
+
+    def place(digest: str):
+        src, dsts = groups[digest]
+        return place_texture_group(src, dsts, existing.get(digest))
+
+    if jobs == 1 or len(groups) < 2:
+        results = list(map(place, groups))
+    else:
+        with ThreadPoolExecutor(jobs) as pool:
+            results = list(pool.map(place, groups))
+
+    for result in results:
+        stats.add(result)
+
+    return stats
@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from argparse import ArgumentParser
+from time import perf_counter
+from pathlib import Path
+from json import loads
+
+from builder.compilers import COMPILERS, Compiler
+from project import FORMAT_SUFFIXES, Project, convert
+from builder import build_project
+
+
+def is_project_file(path: Path):
+    if path.suffix in ('.tmb', '.tmbdb'):
+        return True
+    elif path.suffix != '.json':
+        return False
+
+    try:
+        json = loads(path.read_text('utf-8'))
+    except (ValueError, OSError):
+        return False
+
+    return isinstance(json, dict) and {'name', 'content', 'config'} <= json.keys()
+
+def find_projects(paths: list[Path]):
+    """Expand the given files and directories into the project files to build, without duplicates."""
+
+    projects: list[Path] = []
+    for path in paths:
+        candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+        for candidate in candidates:
+            candidate = candidate.resolve()
+            if candidate not in projects and candidate.is_file() and is_project_file(candidate):
+                projects.append(candidate)
+
+    return projects
+
+def build_one(path: Path, workers: int | None, processes: bool, compiler: Compiler):
+    start = perf_counter()
+    report = None
+    try:
+        report = build_project(Project.load(path), workers, processes, compiler)
+        error = None
+        if not report.success:
+            errors = [line for line in report.compiler_output if ': error ' in line]
+            error = (errors or report.compiler_output or ['build failed'])[-1]
+    except Exception as e:
+        error = f'{e.__class__.__name__}: {e}'
+
+    return path, report, perf_counter() - start, error
+
+def main(args: list[str]):
+    """Build one or more projects without the editor. Returns the process exit code."""
+
+    parser = ArgumentParser(prog='main.py build', description='Build tModBuilder projects headlessly.')
+    parser.add_argument('paths', nargs='+', type=Path,
+                        help='project files, or directories to search for project files')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='how many projects to build at the same time')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='code generation workers per project (defaults to one per CPU)')
+    parser.add_argument('--processes', action='store_true',
+                        help='generate code on a process pool instead of threads')
+    parser.add_argument('-c', '--compiler', choices=COMPILERS, default='server',
+                        help='how to compile the generated code, "fake" needs no .NET install')
+    parser.add_argument('--profile', action='store_true',
+                        help='print where each build spent its time')
+    options = parser.parse_args(args)
+
+    missing = [path for path in options.paths if not path.exists()]
+    if missing:
+        parser.error(f'path does not exist: {missing[0].as_posix()}')
+
+    projects = find_projects(options.paths)
+    if not projects:
+        parser.error('no project files found')
+
+    # one compiler shared by every build, so a build server is started once and reused
+    compiler = COMPILERS[options.compiler]()
+    start = perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max(1, options.jobs)) as pool:
+        futures = [
+            pool.submit(build_one, path, options.workers, options.processes, compiler)
+            for path in projects
+        ]
+
+        for future in as_completed(futures):
+            path, report, seconds, error = future.result()
+            if error is None:
+                print(f'OK    {seconds:8.2f}s  {path.as_posix()}', flush=True)
+            else:
+                failed += 1
+                print(f'FAIL  {seconds:8.2f}s  {path.as_posix()}: {error}', flush=True)
+
+            if options.profile and report is not None:
+                print(report.summary(), flush=True)
+
+    compiler.close()
+    print(f'{len(projects) - failed} built, {failed} failed in {perf_counter() - start:.2f}s')
+    return 1 if failed else 0
+
+def convert_main(args: list[str]):
+    """Convert projects between the json, binary and sqlite formats. Returns the process exit code."""
+
+    parser = ArgumentParser(prog='main.py convert',
+                            description='Convert tModBuilder projects to another format.')
+    parser.add_argument('paths', nargs='+', type=Path,
+                        help='project files, or directories to search for project files')
+    parser.add_argument('--to', choices=FORMAT_SUFFIXES, required=True,
+                        help='the format to convert to, the originals are kept')
+    options = parser.parse_args(args)
+
+    projects = find_projects(options.paths)
+    if not projects:
+        parser.error('no project files found')
+
+    for path in projects:
+        if path.suffix == FORMAT_SUFFIXES[options.to]:
+            continue
+
+        converted = convert(path, options.to)
+        print(f'{path.as_posix()} -> {converted.as_posix()} ({converted.stat().st_size:,} bytes)')
+
+    return 0
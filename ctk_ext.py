@@ -1,6 +1,8 @@
-from tkinter import BOTH
+from typing import Any, Callable, Sequence
+from tkinter import BOTH, LEFT, RIGHT, Y, EventType
+from sys import platform
 
-from customtkinter import CTk, CTkFrame
+from customtkinter import CTk, CTkFrame, CTkScrollbar, ScalingTracker
 from overloading import overload
 
 
@@ -18,11 +20,203 @@ def hex_to_rgb(hex: str):
 class CTkPage(CTkFrame):
     pass
 
+class CTkVirtualList(CTkFrame):
+    """A scrolling list of `items` that only has widgets for the rows in view, reusing them as the
+list is scrolled, so it has as many widgets for a thousand items as for ten. Every row takes
+`row_height` pixels, `make_row(parent)` makes an empty row widget and `bind_row(row, index, item)`
+shows an item in one. Call `refresh` after changing `items`, only rows whose item changed are
+shown again."""
+
+    def __init__(
+        self, master, items: Sequence, row_height: int, make_row: Callable[[Any], Any],
+        bind_row: Callable[[Any, int, Any], None], **kwargs
+    ):
+        super().__init__(master, **kwargs)
+
+        self.items = items
+        self.row_height = row_height
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.offset = 0.0 # how far the list is scrolled, in pixels
+        self.rows: list[Any] = []
+        # the index and item each row shows, so unchanged rows are not shown again
+        self.bound: list[tuple[int, Any] | None] = []
+
+        self.scrollbar = CTkScrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.body = CTkFrame(self, fg_color='transparent')
+        self.body.pack(side=LEFT, fill=BOTH, expand=True, padx=10)
+        self.body.bind('<Configure>', lambda _: self.refresh())
+
+        # scrolled like `CTkScrollableFrame`, when the wheel is turned over any of the rows
+        sequences = ['<Button-4>', '<Button-5>'] if 'linux' in platform else ['<MouseWheel>']
+        self.wheel_bindings = [
+            (sequence, self.bind_all(sequence, self.mouse_wheel, add=True)) for sequence in sequences
+        ]
+
+    def destroy(self):
+        # `bind_all` handlers outlive the widget, and only this list's may be removed, others (like
+        # customtkinter's) are bound to the same sequences
+        for sequence, funcid in self.wheel_bindings:
+            script = self.tk.call('bind', 'all', sequence)
+            kept = '\n'.join(line for line in script.split('\n') if funcid not in line)
+            self.tk.call('bind', 'all', sequence, kept)
+            self.deletecommand(funcid)
+
+        self.wheel_bindings = []
+        super().destroy()
+
+    @property
+    def view_height(self):
+        # placing rows is scaled by customtkinter, so everything is in unscaled pixels
+        return self.body.winfo_height() / ScalingTracker.get_widget_scaling(self)
+
+    def refresh(self):
+        view = self.view_height
+        total = len(self.items) * self.row_height
+        self.offset = max(0.0, min(self.offset, total - view))
+
+        first = int(self.offset // self.row_height)
+        visible = min(len(self.items) - first, int(view // self.row_height) + 2)
+        while len(self.rows) < visible:
+            self.rows.append(self.make_row(self.body))
+            self.bound.append(None)
+
+        shown = set()
+        for index in range(first, first + visible):
+            slot = index % len(self.rows)
+            row = self.rows[slot]
+            item = self.items[index]
+            bound = self.bound[slot]
+            if bound is None or bound[0] != index or bound[1] is not item:
+                self.bind_row(row, index, item)
+                self.bound[slot] = (index, item)
+
+            row.place(x=0, y=index * self.row_height - self.offset, relwidth=1.0)
+            shown.add(slot)
+
+        for slot, row in enumerate(self.rows):
+            if slot not in shown:
+                row.place_forget()
+                self.bound[slot] = None
+
+        if total > view:
+            self.scrollbar.set(self.offset / total, (self.offset + view) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, index: int):
+        """Scroll just enough for the item at `index` to be in view."""
+
+        top = index * self.row_height
+        view = self.view_height
+        if top < self.offset:
+            self.offset = top
+        elif top + self.row_height > self.offset + view:
+            self.offset = top + self.row_height - view
+
+        self.refresh()
+
+    def yview(self, action: str, amount: str, unit: str | None = None):
+        total = len(self.items) * self.row_height
+        if action == 'moveto':
+            self.offset = float(amount) * total
+        elif unit == 'pages':
+            self.offset += int(amount) * self.view_height
+        else:
+            self.offset += int(amount) * self.row_height
+
+        self.refresh()
+
+    def mouse_wheel(self, event):
+        if not str(event.widget).startswith(str(self.body)):
+            return
+
+        if 'linux' in platform:
+            self.offset += self.row_height if event.num == 5 else -self.row_height
+        elif platform.startswith('win'):
+            self.offset -= event.delta / 120 * self.row_height
+        else:
+            self.offset -= event.delta * self.row_height / 4
+
+        self.refresh()
+
+# milliseconds between the frames of every animation in a window
+ANIMATION_INTERVAL = 250
+
+class AnimationScheduler:
+    """Runs the animations of every widget in a window from one timer, which only runs while there
+is something to animate and the window is not minimized or hidden. `step(frame)` is called with a
+frame counter on each tick for each registered widget that is on screen, until the widget is
+destroyed or unregistered."""
+
+    def __init__(self, root: CTk, interval: int = ANIMATION_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.animations: dict[Any, Callable[[int], None]] = {}
+        self.timer: str | None = None
+        self.frame = 0
+        self.paused = False
+
+        root.bind('<Unmap>', self.window_changed, add=True)
+        root.bind('<Map>', self.window_changed, add=True)
+
+    def register(self, widget, step: Callable[[int], None]):
+        """Animate `widget`, replacing its previous animation if it had one."""
+
+        if widget not in self.animations:
+            widget.bind('<Destroy>', lambda event: self.destroyed(widget, event), add=True)
+
+        self.animations[widget] = step
+        self.start()
+
+    def unregister(self, widget):
+        self.animations.pop(widget, None)
+        if not self.animations:
+            self.stop()
+
+    def destroyed(self, widget, event):
+        # also sent for the widget's children
+        if event.widget is widget:
+            self.unregister(widget)
+
+    def start(self):
+        if self.timer is None and self.animations and not self.paused:
+            self.timer = self.root.after(self.interval, self.tick)
+
+    def stop(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+
+    def window_changed(self, event):
+        # also sent for every widget in the window
+        if event.widget is not self.root:
+            return
+
+        self.paused = event.type == EventType.Unmap
+        if self.paused:
+            self.stop()
+        else:
+            self.start()
+
+    def tick(self):
+        self.timer = None
+        self.frame += 1
+        for widget, step in list(self.animations.items()):
+            if not widget.winfo_exists():
+                self.unregister(widget)
+            elif widget.winfo_viewable(): # hidden widgets, e.g. of a form not in use, are skipped
+                step(self.frame)
+
+        self.start()
+
 class CTkRoot(CTk):
     def __init__(self, fg_color = None, **kwargs):
         super().__init__(fg_color, **kwargs)
 
         self.current_page = None
+        self.animations = AnimationScheduler(self)
 
     def switch_to_page(self, page: CTkPage):
         self.current_page = page
@@ -0,0 +1,170 @@
+from typing import Any, Callable, Sequence, cast
+from operator import attrgetter, itemgetter
+from dataclasses import dataclass, fields
+
+from editor_types.content_types import ContentType, CONTENT_TYPES
+from editor_types.data_types import DataType, DATA_TYPES
+
+
+def field_getter(names: tuple[str, ...], getter=attrgetter) -> Callable[[Any], tuple]:
+    """A function returning the values of these attributes (or items, if `getter` is `itemgetter`)
+as a tuple, however many there are."""
+
+    if len(names) == 1:
+        get_one = getter(names[0])
+        return lambda value: (get_one(value),)
+
+    return getter(*names)
+
+@dataclass
+class DataTypeCodec:
+    """Converts a data type to and from json, with its field names looked up once instead of on
+every value."""
+
+    cls: type[DataType]
+    names: tuple[str, ...]
+    getter: Callable[[Any], tuple]
+    json_getter: Callable[[Any], tuple]
+
+    @staticmethod
+    def compile(cls: type[DataType]):
+        # decoded positionally, so only the fields `__init__` takes, in its order. every data type
+        # is a dataclass even though `DataType` itself is not
+        names = tuple(field.name for field in fields(cast(Any, cls)) if field.init)
+        return DataTypeCodec(cls, names, field_getter(names), field_getter(names, itemgetter))
+
+    def decode(self, json: dict[str, Any]):
+        try:
+            return self.cls(*self.json_getter(json))
+        except KeyError:
+            # saved before some of the fields existed, so those take their defaults
+            return self.cls(**{name: json[name] for name in self.names if name in json})
+
+    def encode(self, value: DataType):
+        encoded = {'type': self.cls.__name__}
+        encoded.update(zip(self.names, self.getter(value)))
+        return encoded
+
+@dataclass
+class ContentCodec:
+    """Converts a content type to and from json, each field being encoded by its data type's codec."""
+
+    cls: type[ContentType]
+    names: tuple[str, ...]
+    getter: Callable[[Any], tuple]
+
+    @staticmethod
+    def compile(cls: type[ContentType]):
+        names = tuple(field.name for field in fields(cls))
+        return ContentCodec(cls, names, field_getter(names))
+
+    def decode(self, json: dict[str, Any]):
+        find = data_types.find
+        kwargs = {}
+        for name in self.names:
+            field_json = json.get(name)
+            if field_json is None:
+                continue
+
+            # fields of unknown data types are left to their default, as they always have been
+            codec = find(field_json['type'])
+            if codec is not None:
+                kwargs[name] = codec.decode(field_json)
+
+        return self.cls(**kwargs)
+
+    def encode(self, content: ContentType):
+        encoded: dict[str, Any] = {'type': self.cls.__name__}
+        for name, value in zip(self.names, self.getter(content)):
+            encoded[name] = data_types.of(value.__class__).encode(value)
+
+        return encoded
+
+class Registry[T]:
+    """Looks up the codec of a type by its name or class in constant time. Types appended to
+`types` after the registry was made are picked up the next time an unknown name is looked up."""
+
+    def __init__(self, types: Sequence[type], compile: Callable[[type], T]):
+        self.types = types
+        self.compile = compile
+        self.by_name: dict[str, T] = {}
+        self.by_class: dict[type, T] = {}
+        self.registered = 0
+
+    def refresh(self):
+        for cls in self.types[self.registered:]:
+            self.by_name[cls.__name__] = self.of(cls)
+
+        self.registered = len(self.types)
+
+    def find(self, name: str) -> T | None:
+        codec = self.by_name.get(name)
+        if codec is None and self.registered != len(self.types):
+            self.refresh()
+            codec = self.by_name.get(name)
+
+        return codec
+
+    def of(self, cls: type) -> T:
+        codec = self.by_class.get(cls)
+        if codec is None:
+            codec = self.by_class[cls] = self.compile(cls)
+
+        return codec
+
+
+data_types = Registry[DataTypeCodec](DATA_TYPES, DataTypeCodec.compile)
+content_types = Registry[ContentCodec](CONTENT_TYPES, ContentCodec.compile)
+
+def content_type_name(json: dict[str, Any]) -> str:
+    """The name of the content type of the item `json`, raising a `ValueError` if it has none."""
+
+    name = json.get('type')
+    if not isinstance(name, str):
+        raise ValueError('A content item in the project file has no type')
+
+    return name
+
+def decode_content(json: dict[str, Any]):
+    """The content described by `json`, or `None` if its type is not registered. `json` is left
+unchanged."""
+
+    codec = content_types.find(content_type_name(json))
+    return codec.decode(json) if codec is not None else None
+
+def shape_decoder(content_type: str, fields: list[tuple[str, str, tuple[str, ...], str]]):
+    """Makes the function building content straight from the leaf values of a binary project's
+content layout (see `binary_project`), skipping the json in between. Content of unknown types is
+decoded as `None`."""
+
+    codec = content_types.find(content_type)
+    if codec is None:
+        return lambda values: None
+
+    parts = []
+    start = 0
+    for name, typ, keys, _ in fields:
+        end = start + len(keys)
+        data_codec = data_types.find(typ)
+        if data_codec is not None and name in codec.names:
+            # the layout matches the data type's fields unless it was saved by an older version
+            positional = keys == data_codec.names
+            parts.append((name, data_codec.cls, None if positional else keys, start, end))
+
+        start = end
+
+    cls = codec.cls
+    def decode_values(values: list):
+        kwargs = {}
+        for name, data_cls, keys, start, end in parts:
+            if keys is None:
+                kwargs[name] = data_cls(*values[start:end])
+            else:
+                kwargs[name] = data_cls(**dict(zip(keys, values[start:end])))
+
+        return cls(**kwargs)
+
+    return decode_values
+
+def encode_content(content: ContentType):
+    return content_types.of(content.__class__).encode(content)
@@ -1,10 +1,9 @@
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from typing import override
-from shutil import copyfile
 
 from editor_types.data_types import Int, Float, String, Bool, Image, Rarity, CoinValue
-from pages.editor.builder import BuildContext, Localization, Method, Property, PropertyFlags
+from builder import BuildContext, Localization, Method, Property, PropertyFlags
 
 
 @dataclass
@@ -27,6 +26,13 @@ Defaults to removing all spaces from the result of `.get_name()`."""
     def build_localization(self, ctx: BuildContext) -> Localization:
         """Build the localization code for this content type."""
 
+    def build_localizations(self, ctx: BuildContext, languages: list[str]) -> dict[str, Localization]:
+        """Build the localization code for every language the mod is localized into.
+Defaults to using the result of `.build_localization()` for all of them, override it to translate."""
+
+        localization = self.build_localization(ctx)
+        return {language: localization for language in languages}
+
 
 @dataclass
 class Item(ContentType):
@@ -53,18 +59,19 @@ class Item(ContentType):
     
     @override
     def build(self, ctx: BuildContext):
-        width, height = self.texture.image.size
+        width, height = self.texture.size
 
-        copyfile(self.texture.path, ctx.build_dir / 'Content' / f'{self.get_internal_name()}.png')
+        ctx.output.copy_file(
+            self.texture.path, ctx.build_dir / 'Content' / f'{self.get_internal_name()}.png'
+        )
         ctx.class_bases.append('ModItem')
-        ctx.class_methods.append(Method(
-            'SetDefaults', [], 'void', f"""Item.height = {height};
-Item.width = {width};
-
-Item.rare = {self.rarity};
-Item.value = {self.value};
-"""
-        ))
+        ctx.add_method(Method('SetDefaults', [], 'void', [
+            f'Item.height = {height};',
+            f'Item.width = {width};',
+            '',
+            f'Item.rare = {self.rarity};',
+            f'Item.value = {self.value};'
+        ]))
 
 @dataclass
 class Material(Item):
@@ -75,14 +82,14 @@ class Material(Item):
     def build(self, ctx: BuildContext):
         super().build(ctx)
 
-        ctx.class_methods.append(Method(
-            'SetStaticDefaults', [], 'void', f'Item.ResearchUnlockCount = {self.research_amount};'
+        ctx.add_method(Method(
+            'SetStaticDefaults', [], 'void', [f'Item.ResearchUnlockCount = {self.research_amount};']
         ))
 
         set_defaults = ctx.find_method('SetDefaults')
         assert set_defaults is not None
 
-        set_defaults.body_code += f'\nItem.maxStack = {self.max_stack};'
+        set_defaults.add(f'Item.maxStack = {self.max_stack};')
 
 @dataclass
 class Sword(Item):
@@ -101,16 +108,17 @@ class Sword(Item):
         set_defaults = ctx.find_method('SetDefaults')
         assert set_defaults is not None
 
-        set_defaults.body_code += f"""
-Item.autoReuse = {self.auto_reuse};
-Item.useTime = {self.use_time};
-Item.useAnimation = {self.use_animation};
-Item.useTurn = {self.use_turn};
-Item.DamageType = DamageClass.Melee;
-Item.useStyle = ItemUseStyleID.Swing;
-
-Item.SetWeaponValues({self.damage}, {self.knockback}, {self.crit_chance});
-"""
+        set_defaults.add(
+            '',
+            f'Item.autoReuse = {self.auto_reuse};',
+            f'Item.useTime = {self.use_time};',
+            f'Item.useAnimation = {self.use_animation};',
+            f'Item.useTurn = {self.use_turn};',
+            'Item.DamageType = DamageClass.Melee;',
+            'Item.useStyle = ItemUseStyleID.Swing;',
+            '',
+            f'Item.SetWeaponValues({self.damage}, {self.knockback}, {self.crit_chance});'
+        )
 
 @dataclass
 class Accessory(Item):
@@ -150,30 +158,28 @@ class Accessory(Item):
         set_defaults = ctx.find_method('SetDefaults')
         assert set_defaults is not None
 
-        set_defaults.body_code += """
-Item.accessory = true;
-"""
+        set_defaults.add('', 'Item.accessory = true;')
 
-        ctx.class_properties.append(Property(
+        ctx.add_property(Property(
             'MovementSpeedIncrease', 'float', str(self.movement_speed), flags=PropertyFlags(readonly=True)
         ))
         
-        ctx.class_properties.append(Property(
+        ctx.add_property(Property(
             'IncreaseJumpHeight', 'float', str(self.jump_height), flags=PropertyFlags(readonly=True)
         ))
         
-        ctx.class_properties.append(Property(
+        ctx.add_property(Property(
             'Tooltip', 'LocalizedText', 'base.Tooltip.WithFormatArgs(MovementSpeedIncrease)', False,
             flags=PropertyFlags(override=True)
         ))
         
-        ctx.class_methods.append(Method(
-            'UpdateAccessory', [('Player', 'player'), ('bool', 'hideVisual')],
-            'void', f"""
-player.moveSpeed += {self.movement_speed} / 100f;
-player.jumpSpeedBoost += {self.jump_height} / 100f;
-player.noFallDmg = {self.no_fall_damage};
-"""))
+        ctx.add_method(Method(
+            'UpdateAccessory', [('Player', 'player'), ('bool', 'hideVisual')], 'void', [
+                f'player.moveSpeed += {self.movement_speed} / 100f;',
+                f'player.jumpSpeedBoost += {self.jump_height} / 100f;',
+                f'player.noFallDmg = {self.no_fall_damage};'
+            ]
+        ))
 
 
 CONTENT_TYPES = [Item, Material, Accessory, Sword]
@@ -1,21 +1,22 @@
-from tkinter.filedialog import askopenfilename
+from typing import TYPE_CHECKING, Any
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from tkinter import X, BOTH
-from typing import Any
-from os import getcwd
+from functools import lru_cache
+from os import getcwd, stat
+from struct import unpack
 
 from PIL.Image import open as imopen
-from customtkinter import (
-    CTkFrame, CTkEntry, CTkImage, CTkLabel, CTkButton, CTkCheckBox, CTkToplevel, CTkScrollableFrame
-)
 
 from editor_types.rarities import rarities, rarity_colors
 
+# the widgets are imported inside the `display` methods so that headless builds never load Tk
+if TYPE_CHECKING:
+    from customtkinter import CTkFrame
+
 
 class DataType(ABC):
     @abstractmethod
-    def display(self, parent: CTkFrame) -> list[Any] | Any:
+    def display(self, parent: 'CTkFrame') -> list[Any] | Any:
         """Change what will show up in the properties window in the editor.
 Note that this method's return value is NOT added to the parent, it has to be done manually.
 There are utility methods in this class to help e.g. `display_entry` and `display_dropdown` which
@@ -26,11 +27,20 @@ add to the parent automatically. This method should return what you need in `.re
         """Read the value of this data type, the type of widget will be the same as the result of the
 `.display` method. This is used for saving the value of the data type."""
 
+    def rebind(self, widget) -> bool:
+        """Show this value in the widgets `.display` made for another value of the same data type, so
+the editor can reuse its properties form instead of making it again. Returns `False` if the data
+type cannot do this, the form is then made again with `.display`."""
+
+        return False
 
     def display_entry(self, parent, value: Any, label_text: str | None = None):
         """Utility method to display an editable entry widget with the given value and label text.
 Used by `Int.display`, `Float.display` and `String.display`."""
 
+        from customtkinter import CTkEntry, CTkLabel
+        from tkinter import X
+
         if label_text is not None:
             label = CTkLabel(parent, text=label_text, font=('Andy', 20), fg_color='transparent')
             label.pack(fill=X)
@@ -39,8 +49,17 @@ Used by `Int.display`, `Float.display` and `String.display`."""
         entry.insert(0, value)
         entry.pack(fill=X)
         return entry
+
+    def rebind_entry(self, entry, value: Any):
+        """Utility method to show another value in an entry made by `display_entry`."""
+
+        entry.delete(0, 'end')
+        entry.insert(0, value)
     
     def picker_window(self, parent, title: str, choices: list[str]):
+        from customtkinter import CTkButton, CTkToplevel, CTkScrollableFrame
+        from tkinter import X, BOTH
+
         window = CTkToplevel(parent)
         window.title(title)
         window.geometry('400x300')
@@ -82,6 +101,10 @@ class Int(DataType):
     def read(self, widget):
         return Int(int(widget.get().strip()))
 
+    def rebind(self, widget):
+        self.rebind_entry(widget, self.value)
+        return True
+
 @dataclass
 class Float(DataType):
     value: float = 0.0
@@ -95,6 +118,10 @@ class Float(DataType):
     def read(self, widget):
         return Float(float(widget.get().strip()))
 
+    def rebind(self, widget):
+        self.rebind_entry(widget, self.value)
+        return True
+
 @dataclass
 class String(DataType):
     value: str = ''
@@ -108,6 +135,10 @@ class String(DataType):
     def read(self, widget):
         return String(widget.get())
 
+    def rebind(self, widget):
+        self.rebind_entry(widget, self.value)
+        return True
+
 @dataclass
 class Bool(DataType):
     value: bool = False
@@ -116,9 +147,12 @@ class Bool(DataType):
         return str(self.value).lower()
 
     def display(self, parent):
+        from customtkinter import CTkCheckBox
+        from tkinter import X
+
+        # the checkbox keeps the edited value, `self` is shared with the project's undo history
         def check():
-            self.value = not self.value
-            checkbox.configure(text='true' if self.value else 'false')
+            checkbox.configure(text='true' if checkbox.get() else 'false')
 
         checkbox = CTkCheckBox(
             parent, text='true' if self.value else 'false', fg_color='#095000',
@@ -136,30 +170,72 @@ class Bool(DataType):
     def read(self, widget):
         return Bool(bool(widget.get()))
 
+    def rebind(self, widget):
+        if self.value:
+            widget.select()
+        else:
+            widget.deselect()
+
+        widget.configure(text='true' if self.value else 'false')
+        return True
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+@lru_cache(maxsize=4096)
+def read_image_size(path: str, mtime_ns: int) -> tuple[int, int]:
+    with open(path, 'rb') as f:
+        header = f.read(24)
+
+    # a PNG's first chunk is always IHDR, which starts with the width and height
+    if header[:8] == PNG_SIGNATURE and header[12:16] == b'IHDR':
+        return unpack('>II', header[16:24])
+
+    with imopen(path) as image: # PIL only parses the header until the image is loaded
+        return image.size
+
+# decoded images shared by every `Image`, keyed by path and modification time so edits are picked up
+@lru_cache(maxsize=64)
+def decode_image(path: str, mtime_ns: int):
+    image = imopen(path)
+    image.load()
+    return image
+
 @dataclass
 class Image(DataType):
     path: str = f'{getcwd()}/assets/placeholder_image.png'
-
-    def __post_init__(self):
-        self.image = imopen(self.path)
     
     def __str__(self):
         return self.path
 
+    @property
+    def size(self):
+        """The width and height of the image, read from its header without decoding it."""
+
+        return read_image_size(self.path, stat(self.path).st_mtime_ns)
+
+    @property
+    def image(self):
+        """The decoded image. Only needed for displaying it, use `.size` for the dimensions."""
+
+        return decode_image(self.path, stat(self.path).st_mtime_ns)
+
     def display(self, parent):
+        from customtkinter import CTkImage, CTkLabel, CTkButton
+        from tkinter.filedialog import askopenfilename
+        from editor_types.thumbnails import thumbnail
+        from tkinter import X
+
         def browse():
             path = askopenfilename(filetypes=[
                 ('Image Files', '*.png'), ('All Files', '*.*')
             ], title='Browse Image')
             if path:
-                self.path = path
-                self.image = imopen(path)
-                img_label.path = self.path
-                img_label.configure(image=CTkImage(self.image, size=self.image.size))
-
-        img_label = CTkLabel(parent, image=CTkImage(
-            self.image, size=self.image.size
-        ), text='')
+                img_label.path = path
+                preview = thumbnail(path)
+                img_label.configure(image=CTkImage(preview, size=preview.size))
+
+        preview = thumbnail(self.path)
+        img_label = CTkLabel(parent, image=CTkImage(preview, size=preview.size), text='')
         img_label.path = self.path
         img_label.pack(fill=X, padx=5)
 
@@ -174,6 +250,19 @@ class Image(DataType):
         path = widget.path
         return Image(path)
 
+    def rebind(self, widget):
+        from customtkinter import CTkImage
+        from editor_types.thumbnails import thumbnail
+
+        widget.path = self.path
+        preview = thumbnail(self.path)
+        widget.configure(image=CTkImage(preview, size=preview.size))
+        return True
+
+# rarities shown cycling through the colors from `MIN_RAINBOW_INDEX` on
+RAINBOW_RARITIES = ('Expert', 'Master')
+MIN_RAINBOW_INDEX = 2
+
 @dataclass
 class Rarity(DataType):
     rare: str = 'White'
@@ -182,47 +271,51 @@ class Rarity(DataType):
     def color(self):
         return rarity_colors[self.rare]
 
-    def __post_init__(self):
-        self.MIN_RAINBOW_INDEX = 2
-        self.rainbow_index = self.MIN_RAINBOW_INDEX
-        self.RAINBOW_SPEED_MILLISECONDS = 250
-
     def __str__(self):
         return f'ItemRarityID.{self.rare.replace(" ", "")}'
 
     def display(self, parent):
-        def rainbow_btn():
-            if self.rainbow_index >= len(rarity_colors):
-                self.rainbow_index = self.MIN_RAINBOW_INDEX
+        from customtkinter import CTkButton
+        from tkinter import X
 
-            rainbow_color = rarity_colors[list(rarity_colors.keys())[self.rainbow_index]]
-            btn.configure(fg_color=rainbow_color, text=self.rare)
-            self.rainbow_index += 1
-
-            if self.rare not in ('Expert', 'Master'):
-                update_button()
-
-            btn.after(self.RAINBOW_SPEED_MILLISECONDS, rainbow_btn)
+        # the picked rarity is kept by the button, `self` is shared with the project's undo history
+        # and the button may be rebound to another rarity (see `rebind`)
+        def rainbow_btn(frame: int):
+            colors = list(rarity_colors.values())[MIN_RAINBOW_INDEX:]
+            btn.configure(fg_color=colors[frame % len(colors)], text=btn.rare)
 
         def update_button():
-            if self.rare in ('Expert', 'Master'):
-                rainbow_btn()
+            # run by the window's `AnimationScheduler`, which a window that is not a `CTkRoot` lacks
+            animations = getattr(btn.winfo_toplevel(), 'animations', None)
+            if btn.rare not in RAINBOW_RARITIES:
+                btn.configure(fg_color=rarity_colors[btn.rare], text=btn.rare)
+                if animations is not None:
+                    animations.unregister(btn)
             else:
-                btn.configure(fg_color=self.color, text=self.rare)
+                rainbow_btn(0)
+                if animations is not None:
+                    animations.register(btn, rainbow_btn)
 
         def window():
             choice = self.picker_window(btn, 'Rarities', rarities)
             if choice != '':
-                self.rare = choice
+                btn.rare = choice
                 update_button()
 
         btn = CTkButton(parent, font=('Andy', 20), corner_radius=10, command=window)
+        btn.rare = self.rare
+        btn.update_button = update_button
         btn.pack(fill=X, padx=5)
         update_button()
         return btn
     
     def read(self, widget):
-        return Rarity(widget.cget('text'))
+        return Rarity(widget.rare)
+
+    def rebind(self, widget):
+        widget.rare = self.rare
+        widget.update_button()
+        return True
 
 @dataclass
 class CoinValue(DataType):
@@ -242,8 +335,14 @@ class CoinValue(DataType):
         return [platinum, gold, silver, copper]
     
     def read(self, widgets):
-        platinum, gold, silver, copper = widgets
-        return CoinValue(platinum.get(), gold.get(), silver.get(), copper.get())
+        platinum, gold, silver, copper = (int(entry.get().strip()) for entry in widgets)
+        return CoinValue(platinum, gold, silver, copper)
+
+    def rebind(self, widgets):
+        for entry, value in zip(widgets, (self.platinum, self.gold, self.silver, self.copper)):
+            self.rebind_entry(entry, value)
+
+        return True
 
 damage_classes = [
     'Generic', 'Melee', 'Ranged', 'Magic', 'Summon'
@@ -258,12 +357,17 @@ class DamageBoost(DataType):
         return f'DamageClass.{self.damage_class}'
     
     def display(self, parent):
+        from customtkinter import CTkButton
+        from tkinter import X
+
         def window():
             choice = self.picker_window(btn, 'Classes', damage_classes)
             if choice != '':
-                self.damage_class = choice
+                btn.configure(text=choice)
 
-        btn = CTkButton(parent, font=('Andy', 20), corner_radius=10, command=window)
+        btn = CTkButton(
+            parent, text=self.damage_class, font=('Andy', 20), corner_radius=10, command=window
+        )
         btn.pack(fill=X, padx=5)
 
         value = self.display_entry(parent, self.value, 'Damage Boost Value')
@@ -273,5 +377,11 @@ class DamageBoost(DataType):
         btn, value = widgets
         return DamageBoost(btn.cget('text'), float(value.get()))
 
+    def rebind(self, widgets):
+        btn, value = widgets
+        btn.configure(text=self.damage_class)
+        self.rebind_entry(value, self.value)
+        return True
+
 
 DATA_TYPES = [Int, Float, String, Bool, Image, Rarity, CoinValue, DamageBoost]
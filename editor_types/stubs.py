@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from json import JSONDecoder
+from typing import Any
+from re import compile
+
+from editor_types.codec import content_types, content_type_name, decode_content, shape_decoder
+from binary_project import BinaryReader, RAW_SHAPE, json_shape_decoder
+from sqlite_store import SqliteStore
+
+
+whitespace = compile(r'[ \t\n\r]*')
+json_decoder = JSONDecoder()
+
+class JsonSource:
+    """The text of a json project file, which its stubs are decoded from."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def json(self, offset: int) -> dict[str, Any]:
+        return json_decoder.raw_decode(self.text, offset)[0]
+
+    def decode(self, offset: int):
+        return decode_content(self.json(offset))
+
+class BinarySource:
+    """A binary project file, which its stubs are decoded from."""
+
+    def __init__(self, reader: BinaryReader):
+        self.reader = reader
+        self.json_decoders: dict[int, Any] = {}
+
+    def json(self, offset: int) -> dict[str, Any]:
+        shape_id, values, _ = self.reader.read(offset)
+        if shape_id == RAW_SHAPE:
+            return values[0]
+
+        decoder = self.json_decoders.get(shape_id)
+        if decoder is None:
+            content_type, fields = self.reader.shapes[shape_id]
+            decoder = self.json_decoders[shape_id] = json_shape_decoder(content_type, fields)
+
+        return decoder(values)
+
+    def decode(self, offset: int):
+        shape_id, values, _ = self.reader.read(offset)
+        return self.reader.decode_values(shape_id, values)
+
+class SqliteSource:
+    """A project database, which its stubs are decoded from."""
+
+    def __init__(self, store: SqliteStore):
+        self.store = store
+
+    def json(self, row_id: int):
+        return self.store.read_content(row_id)
+
+    def decode(self, row_id: int):
+        return decode_content(self.json(row_id))
+
+@dataclass
+class ContentStub:
+    """Stands in for a content item that has not been decoded yet, holding just enough to list it
+in the editor. `offset` is where the item starts in its `source`, or its row id in a database."""
+
+    type: str
+    name: str
+    offset: int
+    source: JsonSource | BinarySource | SqliteSource
+
+    def get_name(self):
+        return self.name
+
+    def materialize(self):
+        return self.source.decode(self.offset)
+
+    def json(self):
+        """The item as `Project.save` writes it, without decoding it into its content type."""
+
+        return self.source.json(self.offset)
+
+def stub_name(json: dict[str, Any]) -> str | None:
+    name = json.get('name')
+    return name.get('value') if isinstance(name, dict) else None
+
+def make_stub(json: dict[str, Any], offset: int, source: JsonSource | BinarySource):
+    """A stub for this item, the item itself if its name cannot be found without decoding it, or
+`None` if its type is unknown."""
+
+    content_type = content_type_name(json)
+    if content_types.find(content_type) is None:
+        return None
+
+    name = stub_name(json)
+    if not isinstance(name, str):
+        return source.decode(offset)
+
+    return ContentStub(content_type, name, offset, source)
+
+def skip_whitespace(text: str, i: int):
+    match = whitespace.match(text, i)
+    assert match is not None
+    return match.end()
+
+def expect(text: str, i: int, char: str):
+    if text[i:i + 1] != char:
+        raise ValueError(f'Expected {char!r} at character {i} of the project file')
+
+    return skip_whitespace(text, i + 1)
+
+def scan_content(text: str, i: int, source: JsonSource):
+    content = []
+    i = expect(text, i, '[')
+    while text[i:i + 1] != ']':
+        # each item is still parsed to find where it ends, but only its name is kept
+        json, end = json_decoder.raw_decode(text, i)
+        stub = make_stub(json, i, source)
+        if stub is not None:
+            content.append(stub)
+
+        i = skip_whitespace(text, end)
+        if text[i:i + 1] == ',':
+            i = skip_whitespace(text, i + 1)
+
+    return content, i + 1
+
+def scan_json(text: str):
+    """Parse a json project file with its content as stubs."""
+
+    source = JsonSource(text)
+    json: dict[str, Any] = {}
+    i = expect(text, skip_whitespace(text, 0), '{')
+    while text[i:i + 1] != '}':
+        key, i = json_decoder.raw_decode(text, i)
+        i = expect(text, skip_whitespace(text, i), ':')
+        if key == 'content':
+            json[key], i = scan_content(text, i, source)
+        else:
+            json[key], i = json_decoder.raw_decode(text, i)
+
+        i = skip_whitespace(text, i)
+        if text[i:i + 1] == ',':
+            i = skip_whitespace(text, i + 1)
+
+    return json
+
+def scan_binary(data: bytes):
+    """Read a binary project file with its content as stubs."""
+
+    reader = BinaryReader(data, shape_decoder, decode_content)
+    source = BinarySource(reader)
+
+    # where each layout keeps the item's name, if it has one
+    name_indexes: list[int | None] = []
+    for _, fields in reader.shapes:
+        name_index = None
+        start = 0
+        for name, _, keys, kinds in fields:
+            if name == 'name' and 'value' in keys and kinds[keys.index('value')] == 's':
+                name_index = start + keys.index('value')
+
+            start += len(keys)
+
+        name_indexes.append(name_index)
+
+    content = []
+    for offset, shape_id, values in reader.records():
+        if shape_id == RAW_SHAPE:
+            stub = make_stub(values[0], offset, source)
+        elif name_indexes[shape_id] is None:
+            stub = reader.decode_values(shape_id, values)
+        else:
+            content_type = reader.shapes[shape_id][0]
+            if content_types.find(content_type) is None:
+                continue
+
+            stub = ContentStub(content_type, values[name_indexes[shape_id]], offset, source)
+
+        if stub is not None:
+            content.append(stub)
+
+    json = reader.project
+    json['content'] = content
+    return json
+
+def scan_sqlite(store: SqliteStore):
+    """Read a project database with its content as stubs, without reading the content itself."""
+
+    source = SqliteSource(store)
+    json = store.read_names()
+    content = []
+    row_ids = []
+    for row_id, content_type, name in json['content']:
+        if content_types.find(content_type) is None:
+            continue
+
+        row_ids.append(row_id)
+        content.append(
+            ContentStub(content_type, name, row_id, source) if name is not None
+            else source.decode(row_id)
+        )
+
+    store.row_ids = row_ids
+    json['content'] = content
+    return json
+
+def sqlite_row_ids(content: list, store: SqliteStore):
+    """The row of each item in the database of `store`, for the stubs read from it, and `None` for
+every other item."""
+
+    sources = {
+        id(item.source): item.source for item in content
+        if isinstance(item, ContentStub) and isinstance(item.source, SqliteSource)
+    }
+    path = store.path.resolve()
+    same = {key for key, source in sources.items() if source.store.path.resolve() == path}
+    return [
+        item.offset if isinstance(item, ContentStub) and id(item.source) in same else None
+        for item in content
+    ]
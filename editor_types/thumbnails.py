@@ -0,0 +1,45 @@
+from functools import lru_cache
+from pathlib import Path
+from os import getpid
+
+from PIL.Image import open as imopen
+
+from builder.textures import file_stamp, hash_texture
+from editor_types.data_types import decode_image, read_image_size
+
+
+thumbnails_folder = Path.cwd() / 'cache' / 'thumbnails'
+# textures bigger than this are scaled down (keeping their aspect ratio) before being displayed
+THUMBNAIL_SIZE = (128, 128)
+
+@lru_cache(maxsize=256)
+def load_thumbnail(digest: str, path: str):
+    """Load the thumbnail of the image with this content hash, from the thumbnail cache folder if
+it was made before, otherwise by scaling down the image at `path` and caching the result."""
+
+    cached = thumbnails_folder / f'{digest}.png'
+    if cached.exists():
+        image = imopen(cached)
+        image.load()
+        return image
+
+    image = imopen(path)
+    image.thumbnail(THUMBNAIL_SIZE)
+
+    thumbnails_folder.mkdir(parents=True, exist_ok=True)
+    # write then rename so another session never reads a half written thumbnail
+    partial = cached.with_name(f'{digest}.{getpid()}.tmp')
+    image.save(partial, 'PNG')
+    partial.replace(cached)
+    return image
+
+def thumbnail(path: str):
+    """The image at `path` as it should be previewed in the editor."""
+
+    source = Path(path)
+    stamp = file_stamp(source)
+    width, height = read_image_size(path, stamp[1])
+    if width <= THUMBNAIL_SIZE[0] and height <= THUMBNAIL_SIZE[1]:
+        return decode_image(path, stamp[1])
+
+    return load_thumbnail(hash_texture(source, stamp), path)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, fields, replace
+from collections import deque
+from typing import Any
+
+from project import Project
+
+
+# steps kept for undoing, the oldest are forgotten past this
+HISTORY_LIMIT = 5000
+
+@dataclass
+class Step:
+    """One edit of a project's content. An edited item keeps only the fields that changed, as
+`{name: value}` before and after the edit, and an added or removed item the item itself. Neither is
+copied: data types are replaced by the editor rather than changed in place, so the history shares
+them with the project."""
+
+    op: str # 'set', 'insert' or 'remove'
+    index: int
+    before: Any = None
+    after: Any = None
+
+def changed_fields(old, new) -> tuple[Any, Any] | None:
+    """The fields that differ between two versions of an item, before and after, or the items
+themselves if they are not of the same type. `None` if nothing changed."""
+
+    if old.__class__ is not new.__class__:
+        return old, new
+
+    before = {}
+    after = {}
+    for field in fields(old):
+        old_value = getattr(old, field.name)
+        new_value = getattr(new, field.name)
+        if old_value is not new_value and old_value != new_value:
+            before[field.name] = old_value
+            after[field.name] = new_value
+
+    return (before, after) if before else None
+
+class History:
+    """Undo and redo of a project's content edits. Editing through this records each change as a
+`Step`, so the history costs memory in proportion to what was changed rather than to the size of
+the project, and undoing a step only touches the item it changed."""
+
+    def __init__(self, project: Project, limit: int = HISTORY_LIMIT):
+        self.project = project
+        self.undos: deque[Step] = deque(maxlen=limit)
+        self.redos: list[Step] = []
+
+    @property
+    def can_undo(self):
+        return bool(self.undos)
+
+    @property
+    def can_redo(self):
+        return bool(self.redos)
+
+    def record(self, step: Step):
+        self.undos.append(step)
+        self.redos.clear()
+
+    def set_content(self, index: int, content):
+        delta = changed_fields(self.project.get_content(index), content)
+        self.project.set_content(index, content)
+        if delta is not None:
+            self.record(Step('set', index, *delta))
+
+    def add_content(self, content):
+        self.project.add_content(content)
+        self.record(Step('insert', len(self.project.content) - 1, after=content))
+
+    def remove_content(self, index: int):
+        # decoded first, so undoing it puts back an item rather than a stub of a file it outlived
+        removed = self.project.get_content(index)
+        self.project.remove_content(index)
+        self.record(Step('remove', index, before=removed))
+        return removed
+
+    def apply(self, index: int, change):
+        current = self.project.get_content(index)
+        content = replace(current, **change) if isinstance(change, dict) else change
+        self.project.set_content(index, content)
+
+    def undo(self):
+        """Undo the last step, returning it, or `None` if there is nothing to undo."""
+
+        if not self.undos:
+            return None
+
+        step = self.undos.pop()
+        match step.op:
+            case 'set':
+                self.apply(step.index, step.before)
+            case 'insert':
+                self.project.remove_content(step.index)
+            case 'remove':
+                self.project.insert_content(step.index, step.before)
+
+        self.redos.append(step)
+        return step
+
+    def redo(self):
+        """Redo the last undone step, returning it, or `None` if there is nothing to redo."""
+
+        if not self.redos:
+            return None
+
+        step = self.redos.pop()
+        match step.op:
+            case 'set':
+                self.apply(step.index, step.after)
+            case 'insert':
+                self.project.insert_content(step.index, step.after)
+            case 'remove':
+                self.project.remove_content(step.index)
+
+        self.undos.append(step)
+        return step
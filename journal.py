@@ -0,0 +1,81 @@
+from typing import Any, Callable
+from json import loads, dumps
+from hashlib import sha256
+from pathlib import Path
+from os import fsync, getpid
+
+
+# journals with more entries than this are compacted into the project file on the next save
+JOURNAL_LIMIT = 256
+
+def write_atomic(path: Path, data: bytes):
+    """Write `data` to a temporary file next to `path` and rename it over `path`, so a crash
+mid-write leaves either the old file or the new one, never half of each."""
+
+    partial = path.with_name(f'{path.name}.{getpid()}.tmp')
+    with partial.open('wb') as f:
+        f.write(data)
+        f.flush()
+        fsync(f.fileno())
+
+    partial.replace(path)
+
+def journal_file(project_file: Path):
+    return project_file.with_name(f'{project_file.name}.journal')
+
+def base_hash(data: bytes):
+    """Identifies the project file a journal was written on top of."""
+
+    return sha256(data).hexdigest()
+
+def start_journal(project_file: Path, base: str):
+    """Begin a new, empty journal on top of the project file with this `base_hash`."""
+
+    write_atomic(journal_file(project_file), (dumps({'base': base}) + '\n').encode('utf-8'))
+
+def append_journal(project_file: Path, entries: list[dict[str, Any]]):
+    with journal_file(project_file).open('a', encoding='utf-8') as f:
+        f.write(''.join(dumps(entry) + '\n' for entry in entries))
+        f.flush()
+        fsync(f.fileno())
+
+def read_journal(project_file: Path, base: str) -> tuple[list[dict[str, Any]], bool]:
+    """The entries journaled on top of the project file with this `base_hash`, and whether they
+were all read. A journal left from an older project file is ignored, as is a last entry cut short
+by a crash, in which case the journal must not be appended to, as the next entry would be written
+onto the end of the cut one."""
+
+    path = journal_file(project_file)
+    if not path.exists():
+        return [], True
+
+    text = path.read_text('utf-8')
+    lines = text.splitlines()
+    try:
+        if not lines or loads(lines[0]).get('base') != base:
+            return [], True
+    except ValueError:
+        return [], True
+
+    entries = []
+    for line in lines[1:]:
+        try:
+            entries.append(loads(line))
+        except ValueError:
+            return entries, False
+
+    return entries, text.endswith('\n')
+
+def replay(content: list, entries: list[dict[str, Any]], decode: Callable[[dict], Any]):
+    """Apply journaled changes to the content of a project, decoding their content with `decode`."""
+
+    for entry in entries:
+        match entry['op']:
+            case 'set':
+                content[entry['index']] = decode(entry['content'])
+            case 'insert':
+                content.insert(entry['index'], decode(entry['content']))
+            case 'remove':
+                content.pop(entry['index'])
+            case op:
+                raise ValueError(f'Unknown journal operation: {op}')
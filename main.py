@@ -1,14 +1,17 @@
-from tkinter.messagebox import showerror, ERROR
 from pathlib import Path
-from sys import argv
+from sys import argv, exit
 
-from pages.project_manager import ProjectManager
-from pages.editor import Editor
-from ctk_ext import CTkRoot
 from project import Project
 
 
 def main():
+    # imported here so `main.py build` never loads Tk
+    from tkinter.messagebox import showerror, ERROR
+
+    from pages.project_manager import ProjectManager
+    from pages.editor import Editor
+    from ctk_ext import CTkRoot
+
     root = CTkRoot()
 
     if len(argv) == 1:
@@ -23,7 +26,7 @@ def main():
             showerror('Error', 'File is not a valid tModBuilder project file (.tmb).', icon=ERROR)
             return
         
-        editor = Editor(root, Project.load(file_path))
+        editor = Editor(root, Project.load(file_path, lazy=True))
         root.switch_to_page(editor)
 
     root.mainloop()
@@ -32,4 +35,14 @@ def main():
         pm.save_projects()
 
 if __name__ == '__main__':
+    if len(argv) > 1 and argv[1] == 'build':
+        from cli import main as build_main
+        exit(build_main(argv[2:]))
+    elif len(argv) > 1 and argv[1] == 'convert':
+        from cli import convert_main
+        exit(convert_main(argv[2:]))
+    elif len(argv) > 1 and argv[1] == 'bench':
+        from benchmarks import main as bench_main
+        exit(bench_main(argv[2:]))
+
     main()
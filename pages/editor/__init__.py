@@ -1,13 +1,16 @@
-from tkinter.messagebox import showerror, showinfo, INFO, ERROR, askyesno, QUESTION
-from tkinter import TOP, LEFT, RIGHT, X, Y, BOTH
+from tkinter import TOP, LEFT, RIGHT, BOTTOM, X, Y, BOTH, Entry, Text, Event
+from tkinter.messagebox import ERROR, askyesno, QUESTION
 
 from customtkinter import CTkFrame, CTkButton, CTkLabel
 
 from pages.editor.properties import PropertiesFrame
 from editor_types.content_types import ContentType
+from builder.compilers import BuildServerCompiler
+from pages.editor.build_panel import BuildPanel
 from pages.editor.content_bar import ContentBar
-from pages.editor.builder import build_project
+from pages.editor.autosave import AutoSaver
 from ctk_ext import CTkRoot, CTkPage
+from history import History
 from project import Project
 
 
@@ -16,7 +19,10 @@ class Editor(CTkPage):
         super().__init__(root, fg_color='transparent')
 
         self.project = project
+        self.history = History(project)
         self.root = root
+        # kept for the whole editing session so msbuild stays warm between builds
+        self.compiler = BuildServerCompiler()
 
         root.title('TModBuilder - Editor')
         root.geometry('800x600')
@@ -40,43 +46,126 @@ class Editor(CTkPage):
                                  corner_radius=10, command=self.build)
         self.build_btn.pack(side=LEFT, padx=5)
 
+        self.undo_btn = CTkButton(self.top_bar, text='Undo', font=('Andy', 20), width=20, height=30,
+                                 fg_color='#073B00', hover_color='#0B6000',
+                                 corner_radius=10, command=self.undo)
+        self.undo_btn.pack(side=LEFT, padx=5)
+
+        self.redo_btn = CTkButton(self.top_bar, text='Redo', font=('Andy', 20), width=20, height=30,
+                                 fg_color='#073B00', hover_color='#0B6000',
+                                 corner_radius=10, command=self.redo)
+        self.redo_btn.pack(side=LEFT, padx=5)
+
+        self.save_status = CTkLabel(self.top_bar, text='', font=('Andy', 15))
+        self.save_status.pack(side=LEFT, padx=5)
+
         CTkLabel(self.top_bar, text='TModBuilder - Editor', font=('Andy', 20)).pack(side=RIGHT, padx=5)
 
+        self.build_panel = BuildPanel(self)
+        self.build_panel.pack(fill=X, side=BOTTOM)
+
         self.content_bar = ContentBar(self, project)
         self.content_bar.pack(fill=Y, side=LEFT)
 
         self.properties_frame = PropertiesFrame(self)
         self.properties_frame.pack(fill=BOTH, expand=True, side=RIGHT)
 
+        self.autosaver = AutoSaver(self, project, self.show_save_status)
+
         root.protocol('WM_DELETE_WINDOW', self.on_close)
+        root.bind('<Control-z>', self.undo_key)
+        root.bind('<Control-y>', self.redo_key)
     
     def ask_save(self):
-        if askyesno('Save?', 'Do you want to save your changes?', icon=QUESTION):
-            self.save()
+        # everything else was autosaved, only the content being edited is not in the project yet
+        if self.properties_frame.is_editting and askyesno(
+            'Save?', 'Do you want to save your changes?', icon=QUESTION
+        ):
+            self.properties_frame.save()
 
     def on_close(self):
         self.ask_save()
+        try:
+            self.autosaver.close()
+        except Exception as e:
+            if not askyesno(
+                'Error', f'Your mod could not be saved: {e}\n\nClose without saving?', icon=ERROR
+            ):
+                return
+
+        self.build_panel.close()
+        self.compiler.close()
         self.root.destroy()
+
+    def show_save_status(self, status: str, failed: bool):
+        self.save_status.configure(text=status, text_color='#FF5555' if failed else '#FFFFFF')
+
+    def edited(self):
+        """Call after every change to the project, so it gets autosaved."""
+
+        self.autosaver.schedule()
     
     def create_content(self, content_type: type[ContentType]):
         content = content_type()
-        self.project.content.append(content)
+        self.history.add_content(content)
+        self.edited()
         self.content_bar.load_content()
+        self.content_bar.show_content(len(self.project.content) - 1)
         self.properties_frame.load_content_properties(len(self.project.content) - 1, content)
     
+    def open_content(self, index: int):
+        if 0 <= index < len(self.project.content):
+            self.content_bar.show_content(index)
+            self.properties_frame.load_content_properties(index, self.project.get_content(index))
+
+    def show_step(self, index: int | None):
+        # the form being edited may be of an item the step moved or removed
+        self.properties_frame.reset()
+        self.content_bar.load_content()
+        self.edited()
+        if index is not None:
+            self.content_bar.show_content(index)
+            self.properties_frame.load_content_properties(index, self.project.get_content(index))
+
+    def confirm_step(self):
+        """Undoing or redoing shows the changed item again, so ask before it throws away edits to
+the form that were not saved."""
+
+        return not self.properties_frame.has_changes() or askyesno(
+            'Discard changes?', 'Your unsaved changes to this item will be lost, continue?',
+            icon=QUESTION
+        )
+
+    def undo_key(self, event: Event):
+        # a field being typed in keeps its own keys
+        if not isinstance(event.widget, (Entry, Text)):
+            self.undo()
+
+    def redo_key(self, event: Event):
+        if not isinstance(event.widget, (Entry, Text)):
+            self.redo()
+
+    def undo(self):
+        if not self.history.can_undo or not self.confirm_step():
+            return
+
+        step = self.history.undo()
+        if step is not None:
+            self.show_step(None if step.op == 'insert' else step.index)
+
+    def redo(self):
+        if not self.history.can_redo or not self.confirm_step():
+            return
+
+        step = self.history.redo()
+        if step is not None:
+            self.show_step(None if step.op == 'remove' else step.index)
+
     def save(self):
         if self.properties_frame.is_editting:
             self.properties_frame.save()
         
-        self.project.save()
-        showinfo('Saved', f'Your mod has been saved to {self.project.file.as_posix()}', icon=INFO)
+        self.autosaver.save()
     
     def build(self):
-        success = build_project(self.project)
-        if not success:
-            showerror('Error', 'Your mod could not be built.', icon=ERROR)
-        else:
-            showinfo(
-                'Built', 'Your mod has been built now you can open TModloader and test your mod!',
-                icon=INFO
-            )
+        self.build_panel.start(self.project, self.compiler)
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable
+from time import strftime
+from tkinter import Misc
+
+from project import Project
+
+
+# milliseconds without an edit before the project is saved, and between checks on a running save
+AUTOSAVE_DELAY = 2000
+POLL_INTERVAL = 100
+
+class AutoSaver:
+    """Saves a project on a worker thread a moment after it was last edited, so the window does not
+freeze while it is written. Edits made in quick succession are saved together. The snapshot of what
+to save is taken on the Tk thread, and `on_status` is called back on it with how the save went."""
+
+    def __init__(
+        self, widget: Misc, project: Project, on_status: Callable[[str, bool], None],
+        delay: int = AUTOSAVE_DELAY
+    ):
+        self.widget = widget
+        self.project = project
+        self.on_status = on_status
+        self.delay = delay
+        # one worker, so snapshots are written in the order they were taken
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='autosave')
+        self.scheduled: str | None = None
+        # a failed save loses track of what is on disk, so the next one writes everything
+        self.failed = False
+
+    def schedule(self):
+        """Call after every edit, the project is saved once it has not been edited for `delay`
+milliseconds."""
+
+        self.cancel()
+        self.scheduled = self.widget.after(self.delay, self.save)
+
+    def cancel(self):
+        if self.scheduled is not None:
+            self.widget.after_cancel(self.scheduled)
+            self.scheduled = None
+
+    def save(self, full: bool = False) -> Future | None:
+        """Start saving the changes made since the last save (or the whole project if `full` is
+set) in the background. Returns `None` if there was nothing to save."""
+
+        self.cancel()
+        full = full or self.failed
+        if not full and not self.project.changes:
+            return None
+
+        self.failed = False
+        future = self.executor.submit(self.project.write, self.project.snapshot(), full)
+        self.on_status('Saving...', False)
+        self.poll(future)
+        return future
+
+    def poll(self, future: Future):
+        if not future.done():
+            self.widget.after(POLL_INTERVAL, self.poll, future)
+            return
+
+        error = future.exception()
+        if error is not None:
+            self.failed = True
+            self.on_status(f'Could not save: {error}', True)
+        else:
+            time = strftime('%H:%M:%S')
+            self.on_status(f'Saved at {time}', False)
+
+    def close(self):
+        """Save what is left and wait for every save to finish, before the window is closed. Raises
+the error of the last save if it failed, in which case the saver can still be used to try again."""
+
+        self.cancel()
+        future = self.save()
+        if future is not None:
+            try:
+                future.result()
+            except BaseException:
+                self.failed = True
+                raise
+
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from tkinter import X, Y, BOTH, LEFT, RIGHT, END
+from dataclasses import replace
+from queue import Queue, Empty
+from copy import deepcopy
+
+from customtkinter import CTkFrame, CTkButton, CTkLabel, CTkTextbox, CTkScrollableFrame
+
+from builder.compilers import Compiler, CompileError, parse_errors
+from builder.report import BuildMonitor, BuildReport
+from builder import build_project
+from project import Project
+
+
+# milliseconds between checks on a running build, and the most log lines shown per check
+POLL_INTERVAL = 100
+LOG_BATCH = 500
+
+class BuildPanel(CTkFrame):
+    """Builds the project on a worker thread, so the editor stays usable while msbuild runs. The
+compiler's output is shown as it is printed, along with the stage the build is at, and the errors
+of a failed build are listed as buttons opening the content item they are in."""
+
+    def __init__(self, page):
+        super().__init__(page, fg_color='#063000', height=200)
+
+        self.page = page
+        # ('log', line) or ('stage', name), put by the build and shown by `poll`
+        self.events: Queue[tuple[str, str]] = Queue()
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='build')
+        self.monitor: BuildMonitor | None = None
+        # the internal name of each content item in the build, to find which one an error is in
+        self.content_indexes: dict[str, int] = {}
+
+        header = CTkFrame(self, fg_color='transparent')
+        header.pack(fill=X, padx=5, pady=5)
+
+        self.status = CTkLabel(header, text='Not built yet', font=('Andy', 15))
+        self.status.pack(side=LEFT, padx=5)
+
+        self.cancel_btn = CTkButton(header, text='Cancel', font=('Andy', 15), width=20, height=25,
+                                    fg_color='#073B00', hover_color='#0B6000', corner_radius=10,
+                                    command=self.cancel, state='disabled')
+        self.cancel_btn.pack(side=RIGHT, padx=5)
+
+        body = CTkFrame(self, fg_color='transparent')
+        body.pack(fill=BOTH, expand=True, padx=5, pady=5)
+
+        self.errors = CTkScrollableFrame(body, fg_color='#073B00', width=250, label_text='Errors',
+                                         label_font=('Andy', 15, 'bold'))
+        self.errors.pack(side=RIGHT, fill=Y, padx=5)
+
+        self.log = CTkTextbox(body, fg_color='#042000', font=('Consolas', 12), wrap='none',
+                              state='disabled')
+        self.log.pack(side=LEFT, fill=BOTH, expand=True)
+
+    @property
+    def is_building(self):
+        return self.monitor is not None
+
+    def start(self, project: Project, compiler: Compiler):
+        if self.is_building:
+            return
+
+        # the build reads its own copy, content is replaced rather than changed by the editor
+        build_copy = replace(
+            project, content=list(project.content), config=deepcopy(project.config)
+        )
+
+        self.monitor = BuildMonitor(
+            lambda line: self.events.put(('log', line)),
+            lambda stage: self.events.put(('stage', stage))
+        )
+        self.log.configure(state='normal')
+        self.log.delete('1.0', END)
+        self.log.configure(state='disabled')
+        for child in self.errors.winfo_children():
+            child.destroy()
+
+        self.status.configure(text='Building...')
+        self.cancel_btn.configure(state='normal')
+        future = self.executor.submit(
+            build_project, build_copy, compiler=compiler, monitor=self.monitor
+        )
+        self.after(POLL_INTERVAL, self.poll, future, build_copy)
+
+    def cancel(self):
+        if self.monitor is not None:
+            self.monitor.cancel()
+            self.status.configure(text='Cancelling...')
+
+    def poll(self, future: Future, build_copy: Project):
+        lines = []
+        try:
+            for _ in range(LOG_BATCH):
+                kind, text = self.events.get_nowait()
+                if kind == 'stage':
+                    lines.append(f'== {text}')
+                    self.status.configure(text=f'Building: {text}...')
+                else:
+                    lines.append(text)
+        except Empty:
+            pass
+
+        if lines:
+            self.write_log(lines)
+
+        if not future.done() or not self.events.empty():
+            self.after(POLL_INTERVAL, self.poll, future, build_copy)
+            return
+
+        self.monitor = None
+        self.cancel_btn.configure(state='disabled')
+        error = future.exception()
+        if error is not None:
+            self.status.configure(text='Your mod could not be built')
+            self.write_log([f'error: {error}'])
+        else:
+            self.content_indexes = {
+                content.get_internal_name(): i for i, content in enumerate(build_copy.content)
+            }
+            self.show_report(future.result())
+
+    def write_log(self, lines: list[str]):
+        self.log.configure(state='normal')
+        self.log.insert(END, ''.join(line + '\n' for line in lines))
+        self.log.see(END)
+        self.log.configure(state='disabled')
+
+    def show_report(self, report: BuildReport):
+        if report.cancelled:
+            self.status.configure(text='Build cancelled')
+            return
+        elif report.success:
+            built = 'Up to date' if report.up_to_date else 'Built'
+            self.status.configure(
+                text=f'{built} in {report.seconds:.1f}s, now you can open tModLoader and test it!'
+            )
+            return
+
+        errors = parse_errors(report.compiler_output)
+        self.status.configure(text=f'Your mod could not be built: {len(errors)} errors')
+        for error in errors:
+            index = self.content_index(error)
+            state = 'disabled' if index is None else 'normal'
+            CTkButton(
+                self.errors, text=str(error), font=('Andy', 13), anchor='w', fg_color='#094E00',
+                hover_color='#0B5C00', corner_radius=10, state=state,
+                command=lambda i=index: self.page.open_content(i)
+            ).pack(fill=X, padx=5, pady=2)
+
+    def content_index(self, error: CompileError):
+        """The index of the content item whose generated file `error` is in, if it is in one."""
+
+        if error.file is None or error.file.parent.name != 'Content':
+            return None
+
+        return self.content_indexes.get(error.file.stem)
+
+    def close(self):
+        """Cancel any running build and wait for it to stop, before the editor is closed."""
+
+        self.cancel()
+        self.executor.shutdown(wait=True)
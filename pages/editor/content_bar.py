@@ -1,42 +1,57 @@
-from tkinter import X
+from tkinter import BOTH, BOTTOM, TOP
 
-from customtkinter import CTkButton, CTkScrollableFrame
+from customtkinter import CTkButton, CTkFrame, CTkLabel
 
 from editor_types.content_types import ContentType
+from ctk_ext import CTkVirtualList
 from project import Project
 
 
 class ContentBarButton(CTkButton):
-    def __init__(
-        self, page, parent: 'ContentBar', content_idx: int, content_type: ContentType
-    ):
-        super().__init__(parent, text=content_type.get_name(), font=('Andy', 15), corner_radius=10,
-                         fg_color='#084800', hover_color='#0B6000',
-                         command=lambda: page.properties_frame.load_content_properties(
-                             content_idx, content_type))
-
-class ContentBar(CTkScrollableFrame):
+    # made once and reused for whichever item scrolls into its place, see `show`
+    def __init__(self, page, parent):
+        super().__init__(parent, text='', font=('Andy', 15), corner_radius=10,
+                         fg_color='#084800', hover_color='#0B6000', command=self.select)
+
+        self.page = page
+        self.content_idx = 0
+
+    def show(self, content_idx: int, content_type: ContentType):
+        self.content_idx = content_idx
+        self.configure(text=content_type.get_name())
+
+    def select(self):
+        self.page.properties_frame.load_content_properties(
+            self.content_idx, self.page.project.content[self.content_idx]
+        )
+
+class ContentBar(CTkFrame):
     def __init__(self, page, project: Project):
-        super().__init__(page, fg_color='#063000', label_anchor='n', label_font=('Andy', 20, 'bold'),
-                         label_text='Mod Content', label_fg_color='transparent')
-        
+        super().__init__(page, fg_color='#063000')
+
         self.project = project
         self.page = page
 
-        self.load_content()
-
-    def load_content(self):
-        for child in self.winfo_children():
-            child.destroy()
+        CTkLabel(self, text='Mod Content', font=('Andy', 20, 'bold')).pack(side=TOP, pady=5)
 
-        for i, content_type in enumerate(self.project.content):
-            btn = ContentBarButton(self.page, self, i, content_type)
-            btn.pack(fill=X, padx=10, pady=10)
-        
         new_content_button = CTkButton(self, text='New', font=('Andy', 30),
                                        fg_color='#073B00', hover_color='#0B5C00',
                                        corner_radius=10, command=self.pick_content_type)
-        new_content_button.pack(pady=10)
-    
+        new_content_button.pack(side=BOTTOM, pady=10)
+
+        self.content_list = CTkVirtualList(
+            self, project.content, 48, lambda parent: ContentBarButton(page, parent),
+            lambda button, i, content_type: button.show(i, content_type), fg_color='transparent'
+        )
+        self.content_list.pack(fill=BOTH, expand=True)
+
+    def load_content(self):
+        """Show the project's content again after it changed, only the changed rows are redrawn."""
+
+        self.content_list.refresh()
+
+    def show_content(self, content_idx: int):
+        self.content_list.scroll_to(content_idx)
+
     def pick_content_type(self):
         self.page.properties_frame.load_content_picker()
@@ -13,6 +13,21 @@ class PropertyWidgets:
     widgets: list[CTkBaseClass] | CTkBaseClass
     field_name: str
 
+@dataclass
+class PropertyForm:
+    """The properties form of a content type, kept once made and shown again for every item of that
+type by rebinding its widgets to the item's values."""
+
+    frame: CTkScrollableFrame
+    widgets: list[PropertyWidgets]
+
+    def rebind(self, content_type: ContentType):
+        self.frame.configure(label_text=content_type.get_name())
+        return all(
+            getattr(content_type, property.field_name).rebind(property.widgets)
+            for property in self.widgets
+        )
+
 class PropertiesFrame(CTkFrame):
     def __init__(self, page):
         super().__init__(page, fg_color='#073D00')
@@ -21,6 +36,10 @@ class PropertiesFrame(CTkFrame):
         self.current_idx = cast(int, None)
         self.current_widgets = []
         self.page = page
+        # one form per content type, hidden while another one is shown
+        self.forms: dict[type[ContentType], PropertyForm] = {}
+        self.current_form: PropertyForm | None = None
+        self.content_picker: CTkScrollableFrame | None = None
     
     @property
     def is_editting(self):
@@ -29,15 +48,18 @@ class PropertiesFrame(CTkFrame):
     def reset(self):
         self.current_type = None
         self.current_idx = None
-        self.current_widgets.clear()
+        self.current_widgets = []
 
-        for child in self.winfo_children():
-            child.destroy()
+        if self.current_form is not None:
+            self.current_form.frame.pack_forget()
+            self.current_form = None
+
+        if self.content_picker is not None:
+            self.content_picker.destroy()
+            self.content_picker = None
     
-    def save(self):
-        if not self.is_editting:
-            showerror('Error', 'No content selected.', icon=ERROR)
-            return
+    def read_content(self):
+        """The item being edited, with the values currently shown in the form."""
 
         kwargs = {}
         for property in self.current_widgets:
@@ -45,8 +67,28 @@ class PropertiesFrame(CTkFrame):
             content_value = value.read(property.widgets)
             kwargs[property.field_name] = content_value
         
-        new_content_type = self.current_type.__class__(**kwargs)
-        self.page.project.content[self.current_idx] = new_content_type
+        return self.current_type.__class__(**kwargs)
+
+    def has_changes(self):
+        """Whether the form shows edits that are not saved to the project yet."""
+
+        if not self.is_editting:
+            return False
+
+        try:
+            return self.read_content() != self.current_type
+        except ValueError:
+            # a number that is still being typed
+            return True
+
+    def save(self):
+        if not self.is_editting:
+            showerror('Error', 'No content selected.', icon=ERROR)
+            return
+
+        new_content_type = self.read_content()
+        self.page.history.set_content(self.current_idx, new_content_type)
+        self.page.edited()
         self.page.content_bar.load_content()
 
         self.reset()
@@ -56,23 +98,37 @@ class PropertiesFrame(CTkFrame):
             showerror('Error', 'No content selected.', icon=ERROR)
             return
 
-        self.page.project.content.pop(self.current_idx)
+        self.page.history.remove_content(self.current_idx)
+        self.page.edited()
         self.page.content_bar.load_content()
         self.reset()
     
     def load_content_properties(self, content_idx: int, content_type: ContentType):
-        for child in self.winfo_children():
-            child.destroy()
+        self.reset()
+
+        # the content bar lists the project before its content is decoded
+        content_type = self.page.project.get_content(content_idx)
         
         self.current_type = content_type
         self.current_idx = content_idx
 
+        form = self.forms.get(content_type.__class__)
+        if form is None or not form.rebind(content_type):
+            if form is not None:
+                form.frame.destroy()
+
+            form = self.forms[content_type.__class__] = self.make_form(content_type)
+
+        form.frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        self.current_form = form
+        self.current_widgets = form.widgets
+
+    def make_form(self, content_type: ContentType):
         properties = CTkScrollableFrame(
             self, fg_color='transparent', label_anchor='n', label_font=('Andy', 20, 'bold'),
             label_text=content_type.get_name(), label_fg_color='transparent',
             scrollbar_button_color='#095000', scrollbar_button_hover_color='#0B5C00',
         )
-        properties.pack(fill=BOTH, expand=True, padx=10, pady=10)
 
         actions_frame = CTkFrame(properties, fg_color='transparent')
         actions_frame.pack(fill=X, pady=10)
@@ -95,6 +151,7 @@ class PropertiesFrame(CTkFrame):
         )
         delete_button.pack(side=RIGHT, padx=10)
 
+        widgets = []
         for field in fields(content_type):
             field_frame = CTkFrame(properties, fg_color='transparent')
             field_frame.pack(fill=X, pady=10, padx=10)
@@ -103,7 +160,9 @@ class PropertiesFrame(CTkFrame):
             label.pack(side=LEFT)
 
             value = getattr(content_type, field.name)
-            self.current_widgets.append(PropertyWidgets(value.display(properties), field.name))
+            widgets.append(PropertyWidgets(value.display(properties), field.name))
+
+        return PropertyForm(properties, widgets)
     
     def load_content_picker(self):
         if self.is_editting:
@@ -111,11 +170,13 @@ class PropertiesFrame(CTkFrame):
                       icon=ERROR)
             return
         
+        self.reset()
         all_content_types = CTkScrollableFrame(self, fg_color='#084300', label_anchor='n',
                                                label_font=('Andy', 20, 'bold'),
                                                label_text='Select Content Type',
                                                label_fg_color='transparent')
         all_content_types.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        self.content_picker = all_content_types
 
         for content_type in CONTENT_TYPES:
             btn = CTkButton(all_content_types, text=content_type.__name__, fg_color='#073B00',
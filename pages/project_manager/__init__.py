@@ -4,11 +4,13 @@ from tkinter import StringVar
 from json import loads, dumps
 from pathlib import Path
 
-from customtkinter import CTkFrame, CTkButton, CTkLabel, CTkScrollableFrame
+from customtkinter import CTkFrame, CTkButton, CTkLabel
 
 from pages.project_manager.project_frame import ProjectFrame
 from pages.project_manager.new_project import NewProject
-from ctk_ext import CTkRoot, CTkPage
+from pages.project_manager.scanner import ProjectScanner
+from project_index import ProjectIndex, ProjectSummary
+from ctk_ext import CTkRoot, CTkPage, CTkVirtualList
 from project import Project
 
 
@@ -30,12 +32,25 @@ class ProjectManager(CTkPage):
             self.top_bar, text='TModBuilder - Project Manager', font=('Andy', 25, 'bold')
         ).pack(anchor=CENTER, padx=10)
 
-        self.project_list = CTkScrollableFrame(self, fg_color='#063000')
-        self.project_list.pack(side=BOTTOM, fill=BOTH, expand=True)
+        self.index = ProjectIndex()
+        self.projects: list[ProjectSummary] = []
+        self.scanner: ProjectScanner | None = None
 
-        self.projects: list[Project] = []
+        list_frame = CTkFrame(self, fg_color='#063000')
+        list_frame.pack(side=BOTTOM, fill=BOTH, expand=True)
+
+        new_project_button = CTkButton(list_frame, text='New', font=('Andy', 30),
+                                       fg_color='#073B00', hover_color='#0B5C00',
+                                       corner_radius=10, command=self.new_project)
+        new_project_button.pack(side=BOTTOM, pady=10)
+
+        self.project_list = CTkVirtualList(
+            list_frame, self.projects, 120, lambda parent: ProjectFrame(parent, self, root),
+            lambda frame, _, project: frame.show(project), fg_color='transparent'
+        )
+        self.project_list.pack(fill=BOTH, expand=True, pady=10)
+        # the projects show up as they are found, so the window is usable straight away
         self.load_projects()
-        self.add_projects()
     
     def new_project(self):
         name_var = StringVar(self)
@@ -57,38 +72,59 @@ class ProjectManager(CTkPage):
         project = Project(name, path)
         project.save()
 
-        self.projects.append(project)
+        self.projects.append(self.index.summary(project.file))
         self.save_projects()
         self.add_projects()
-    
-    def add_project(self, project: Project):
-        frame = ProjectFrame(self.project_list, self, self.root, project)
-        frame.pack(fill=X, padx=10, pady=10)
+        self.project_list.scroll_to(len(self.projects) - 1)
     
     def add_projects(self):
-        for child in self.project_list.winfo_children():
-            child.destroy()
+        """Show the projects again after the list changed, only the changed rows are redrawn."""
 
-        for project in self.projects:
-            self.add_project(project)
-        
-        new_project_button = CTkButton(self.project_list, text='New', font=('Andy', 30),
-                                       fg_color='#073B00', hover_color='#0B5C00',
-                                       corner_radius=10, command=self.new_project)
-        new_project_button.pack(pady=10)
+        self.project_list.refresh()
     
     def load_projects(self):
-        if projects_file.exists():
-            self.projects.clear()
-            project_list = loads(projects_file.read_text('utf-8'))
-            project_paths = [Path(path) for path in project_list]
-            for path in project_paths:
-                if not path.exists():
-                    showerror('Error', f'Path does not exist: {path.as_posix()}', icon=ERROR)
-                    continue
-
-                self.projects.append(Project.load(path))
-    
+        if not projects_file.exists():
+            return
+
+        project_list = loads(projects_file.read_text('utf-8'))
+        self.projects.clear()
+        self.scanner = ProjectScanner(
+            self, [Path(path) for path in project_list], self.index, self.projects_found,
+            self.scan_done
+        )
+        self.scanner.start()
+
+    def projects_found(self, projects: list[ProjectSummary]):
+        self.projects.extend(projects)
+        self.add_projects()
+
+    def scan_done(self, missing: list[Path], failed: list[tuple[Path, Exception]]):
+        self.scanner = None
+        self.index.save([project.file for project in self.projects])
+
+        problems = [f'Path does not exist: {path.as_posix()}' for path in missing]
+        problems += [f'Could not read {path.as_posix()}: {error}' for path, error in failed]
+        if problems:
+            shown = problems[:10]
+            if len(problems) > len(shown):
+                shown.append(f'...and {len(problems) - len(shown)} more')
+
+            showerror(
+                'Error', f'{len(problems)} projects could not be opened:\n\n' + '\n'.join(shown),
+                icon=ERROR
+            )
+
     def save_projects(self):
         project_paths = [project.file.as_posix() for project in self.projects]
+        if self.scanner is not None:
+            # still listed until the scan gets to them
+            project_paths += [path.as_posix() for path in self.scanner.remaining]
+
         projects_file.write_text(dumps(project_paths)) # save projects
+        self.index.save([project.file for project in self.projects])
+
+    def destroy(self):
+        if self.scanner is not None:
+            self.scanner.stop()
+
+        super().destroy()
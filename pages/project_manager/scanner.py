@@ -0,0 +1,90 @@
+from threading import Thread, Event
+from queue import Queue, Empty
+from typing import Callable
+from pathlib import Path
+from tkinter import Misc
+
+from project_index import ProjectIndex, ProjectSummary
+
+
+# milliseconds between checks for scanned projects, and the most projects shown per check
+POLL_INTERVAL = 50
+BATCH_SIZE = 20
+
+class ProjectScanner:
+    """Checks and summarizes the projects at `paths` on a worker thread, so the window stays usable
+while slow or missing paths are looked at. Found projects are passed to `on_batch` a few at a time
+on the Tk thread, and once every path was looked at `on_done` is given the paths that were missing
+and the ones that could not be read, as `(path, error)`."""
+
+    def __init__(
+        self, widget: Misc, paths: list[Path], index: ProjectIndex,
+        on_batch: Callable[[list[ProjectSummary]], None],
+        on_done: Callable[[list[Path], list[tuple[Path, Exception]]], None]
+    ):
+        self.widget = widget
+        self.paths = paths
+        self.index = index
+        self.on_batch = on_batch
+        self.on_done = on_done
+        # (path, summary or error) in the order of `paths`, then `None` once they are all done
+        self.results: Queue[tuple[Path, ProjectSummary | Exception | None] | None] = Queue()
+        self.stopped = Event()
+        self.missing: list[Path] = []
+        self.failed: list[tuple[Path, Exception]] = []
+        # paths not looked at yet, as far as the Tk thread knows
+        self.remaining = list(paths)
+
+    def start(self):
+        Thread(target=self.scan, name='project-scan', daemon=True).start()
+        self.widget.after(POLL_INTERVAL, self.poll)
+
+    def stop(self):
+        self.stopped.set()
+
+    def scan(self):
+        for path in self.paths:
+            if self.stopped.is_set():
+                return
+
+            try:
+                result = self.index.summary(path) if path.exists() else None
+            except Exception as e:
+                result = e
+
+            self.results.put((path, result))
+
+        self.results.put(None)
+
+    def poll(self):
+        if self.stopped.is_set():
+            return
+
+        found = []
+        done = False
+        for _ in range(BATCH_SIZE):
+            try:
+                item = self.results.get_nowait()
+            except Empty:
+                break
+
+            if item is None:
+                done = True
+                break
+
+            path, result = item
+            self.remaining.pop(0)
+            if result is None:
+                self.missing.append(path)
+            elif isinstance(result, Exception):
+                self.failed.append((path, result))
+            else:
+                found.append(result)
+
+        if found:
+            self.on_batch(found)
+
+        if done:
+            self.on_done(self.missing, self.failed)
+        else:
+            self.widget.after(POLL_INTERVAL, self.poll)
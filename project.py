@@ -1,8 +1,18 @@
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field
 from json import loads, dumps
+from threading import Lock
+from copy import deepcopy
 from pathlib import Path
 from typing import Any
 
+from journal import (
+    JOURNAL_LIMIT, journal_file, write_atomic, base_hash, start_journal, append_journal,
+    read_journal, replay
+)
+from binary_project import load_json, is_binary, encode, decode
+
+
+FORMAT_SUFFIXES = {'json': '.json', 'binary': '.tmb', 'sqlite': '.tmbdb'}
 
 @dataclass
 class ModConfig:
@@ -16,6 +26,7 @@ class ModConfig:
     ])
     description: str = 'Made with TModBuilder!'
     icon: Path = Path.cwd() / 'assets' / 'placeholder_image.png'
+    languages: list[str] = field(default_factory=lambda: ['en-US'])
 
     @staticmethod
     def load(json: dict[str, Any]):
@@ -27,7 +38,8 @@ class ModConfig:
             json['version'],
             json['buildIgnore'],
             json['description'],
-            Path(json['icon'])
+            Path(json['icon']),
+            json.get('languages', ['en-US'])
         )
 
     def save(self):
@@ -39,7 +51,8 @@ class ModConfig:
             'version': self.version,
             'buildIgnore': self.buildIgnore,
             'description': self.description,
-            'icon': self.icon.as_posix()
+            'icon': self.icon.as_posix(),
+            'languages': self.languages
         }
 
 @dataclass
@@ -48,10 +61,25 @@ class Project:
     path: Path
     content: list = field(default_factory=list)
     config: ModConfig = field(default_factory=lambda: ModConfig())
+    format: str = 'json' # one of `FORMAT_SUFFIXES`
+    # content changes not saved yet, as (operation, index, content) in the order they were made
+    changes: list[tuple[str, int, Any]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    # hash of the project file as last loaded or saved, and how many changes are journaled on it
+    base: str | None = field(default=None, init=False, repr=False, compare=False)
+    journaled: int = field(default=0, init=False, repr=False, compare=False)
+    # the database of projects in the sqlite format
+    store: Any = field(default=None, init=False, repr=False, compare=False)
+    # snapshots taken but not written yet, and the lock held while one is written (see `write`)
+    unwritten: list['Project'] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    save_lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
 
     @property
     def file(self):
-        return self.path / f'{self.name}.json'
+        return self.path / f'{self.name}{FORMAT_SUFFIXES[self.format]}'
     
     @property
     def internal_name(self):
@@ -59,60 +87,335 @@ class Project:
 
     @staticmethod
     def load_content(json: dict):
-        from editor_types.content_types import CONTENT_TYPES
-        from editor_types.data_types import DATA_TYPES
-
-        mod_content = []
-        for content in json['content']:
-            content_type = content.pop('type')
-            for typ in CONTENT_TYPES:
-                if content_type != typ.__name__:
-                    continue
+        from editor_types.codec import decode_content
 
-                content_kwargs: dict[str, Any] = {}
-                for field_name, field_json in content.items():
-                    field_type = field_json.pop('type')
-                    for data_type in DATA_TYPES:
-                        if field_type != data_type.__name__:
-                            continue
+        # content of unknown types is skipped
+        decoded = map(decode_content, json['content'])
+        return [content for content in decoded if content is not None]
+
+    @staticmethod
+    def load_store(path: Path, lazy: bool):
+        from editor_types.codec import decode_content
+        from editor_types.stubs import scan_sqlite
+        from sqlite_store import SqliteStore
 
-                        content_kwargs[field_name] = data_type(**field_json)
-                        break
+        store = SqliteStore(path)
+        if lazy:
+            json = scan_sqlite(store)
+        else:
+            json = store.read()
+            decoded = zip(store.row_ids, map(decode_content, json['content']))
+            rows = [(row_id, content) for row_id, content in decoded if content is not None]
+            store.row_ids = [row_id for row_id, _ in rows]
+            json['content'] = [content for _, content in rows]
+
+        project = Project(
+            name=json['name'],
+            path=path.parent,
+            content=json['content'],
+            config=ModConfig.load(json['config']),
+            format='sqlite'
+        )
+        if project.file == path:
+            project.store = store
 
-                mod_content.append(typ(**content_kwargs))
-                break
-        
-        return mod_content
+        return project
 
     @staticmethod
-    def load(path: Path):
-        json = loads(path.read_text('utf-8'))
-        mod_content = Project.load_content(json)
-        return Project(
+    def load(path: Path, lazy: bool = False):
+        """Load the project file at `path`, in any format. If `lazy` is set its content is loaded as
+`ContentStub`s, which are only decoded by `get_content` (or `materialize_all`) when they are
+needed."""
+
+        from editor_types.codec import decode_content, shape_decoder
+        from editor_types.stubs import scan_json, scan_binary
+        from sqlite_store import is_sqlite
+
+        if is_sqlite(path):
+            return Project.load_store(path, lazy)
+
+        data = path.read_bytes()
+        if lazy:
+            json = scan_binary(data) if is_binary(data) else scan_json(data.decode('utf-8'))
+            mod_content = json['content']
+        elif is_binary(data):
+            # binary projects are decoded straight into content, without making the json first
+            json = decode(data, shape_decoder, decode_content)
+            mod_content = [content for content in json['content'] if content is not None]
+        else:
+            json = loads(data)
+            mod_content = Project.load_content(json)
+
+        base = base_hash(data)
+        entries, complete = read_journal(path, base)
+        replay(mod_content, entries, decode_content)
+
+        project = Project(
             name=json['name'],
             path=path.parent,
             content=mod_content,
-            config=ModConfig.load(json['config'])
+            config=ModConfig.load(json['config']),
+            format='binary' if is_binary(data) else 'json'
         )
+        # otherwise the next save writes the whole project: to its own file first, or over a journal
+        # cut short by a crash, which cannot be appended to
+        if project.file == path and complete:
+            project.base = base
+            project.journaled = len(entries)
 
-    def save(self):
-        json = {
+        return project
+
+    def get_content(self, index: int):
+        """The content at `index`, decoding it first if it was loaded lazily."""
+
+        from editor_types.stubs import ContentStub
+
+        content = self.content[index]
+        if isinstance(content, ContentStub):
+            content = self.content[index] = content.materialize()
+
+        return content
+
+    def materialize_all(self):
+        for i in range(len(self.content)):
+            self.get_content(i)
+
+    def set_content(self, index: int, content):
+        self.content[index] = content
+        if self.changes and self.changes[-1][:2] in (('set', index), ('insert', index)):
+            # editing the same item again only needs its latest version saved
+            self.changes[-1] = (self.changes[-1][0], index, content)
+        else:
+            self.changes.append(('set', index, content))
+
+    def add_content(self, content):
+        self.insert_content(len(self.content), content)
+
+    def insert_content(self, index: int, content):
+        self.content.insert(index, content)
+        self.changes.append(('insert', index, content))
+
+    def remove_content(self, index: int):
+        self.changes.append(('remove', index, None))
+        return self.content.pop(index)
+
+    def query(
+        self, content_type: str | None = None, *, internal_name: str | None = None, **where: Any
+    ):
+        """The `(index, content)` of every item of `content_type` (any type if `None`) whose fields
+have these values, given as paths into the item's json like `rarity__rare='Red'`, and whose internal
+name is `internal_name` if given (see `SqliteStore.query`). Saved projects in the sqlite format are
+searched by the database, so only the matching content is decoded."""
+
+        from editor_types.codec import decode_content, encode_content
+        from sqlite_store import content_internal_name
+        from editor_types.stubs import ContentStub
+
+        store = self.store
+        if (
+            store is not None and not self.changes and not self.unwritten and
+            store.path == self.file
+        ):
+            indexes = {row_id: i for i, row_id in enumerate(store.row_ids)}
+            matches = []
+            for row_id, json in store.query(content_type, internal_name=internal_name, **where):
+                i = indexes.get(row_id)
+                if i is None: # content of unknown types is not loaded
+                    continue
+
+                if isinstance(self.content[i], ContentStub):
+                    # already read by the query, so decode it from that instead of reading it again
+                    self.content[i] = decode_content(json)
+
+                matches.append((i, self.content[i]))
+
+            return matches
+
+        matches = []
+        for i, content in enumerate(self.content):
+            json = content.json() if isinstance(content, ContentStub) else encode_content(content)
+            if content_type is not None and json['type'] != content_type:
+                continue
+
+            if internal_name is not None and content_internal_name(json) != internal_name:
+                continue
+
+            for path, value in where.items():
+                found = json
+                for key in path.split('__'):
+                    found = found.get(key) if isinstance(found, dict) else None
+
+                if found != value:
+                    break
+            else:
+                matches.append((i, self.get_content(i)))
+
+        return matches
+
+    def to_json(self):
+        from editor_types.codec import encode_content
+        from editor_types.stubs import ContentStub
+
+        return {
             'name': self.name,
             'path': self.path.as_posix(),
-            'content': [],
+            # content that was never decoded is written back as it was loaded
+            'content': [
+                content.json() if isinstance(content, ContentStub) else encode_content(content)
+                for content in self.content
+            ],
             'config': self.config.save()
         }
 
-        for content_instance in self.content:
-            encoded_content = {'type': content_instance.__class__.__name__}
-            for content_field in fields(content_instance):
-                value = getattr(content_instance, content_field.name)
-                encoded_value = {'type': value.__class__.__name__}
-                for value_field in fields(value):
-                    encoded_value[value_field.name] = getattr(value, value_field.name)
-                
-                encoded_content[content_field.name] = encoded_value
-            
-            json['content'].append(encoded_content)
-        
-        self.file.write_text(dumps(json, indent=4))
+    def snapshot(self):
+        """A copy of the project to save, taking its unsaved changes with it. Content is only ever
+replaced (by `set_content`), never changed in place once saved, so the content list is copied but
+its items are shared, except the changed items, which the editor may still be showing."""
+
+        snapshot = Project(
+            self.name, self.path, list(self.content), deepcopy(self.config), self.format
+        )
+        snapshot.changes = [
+            (op, index, deepcopy(content)) for op, index, content in self.changes
+        ]
+        self.changes = []
+        self.unwritten.append(snapshot)
+        return snapshot
+
+    def save(self):
+        """Write the whole project to its file, replacing any journal."""
+
+        self.write(self.snapshot(), full=True)
+
+    def save_changes(self):
+        """Save the content changed since the last save. Projects in the sqlite format save each
+changed item in its own transaction, the others append the changes to the project's journal,
+which is compacted into the project file once it gets long. Only `set_content`, `add_content`,
+`insert_content` and `remove_content` are tracked, anything else needs a full `save`."""
+
+        self.write(self.snapshot())
+
+    def write(self, snapshot: 'Project', full: bool = False):
+        """Save a `snapshot` of this project, the whole of it if `full` is set or only its changes
+otherwise. Only this touches the project's files, and one snapshot is written at a time, so it can
+run on another thread than the one editing the project."""
+
+        with self.save_lock:
+            try:
+                self.write_snapshot(snapshot, full)
+            except BaseException:
+                # the snapshot's changes are not in the journal, so the next save writes everything
+                self.base = None
+                self.store = None
+                raise
+            finally:
+                # by identity, as snapshots of the same project compare equal
+                self.unwritten.pop(next(
+                    i for i, unwritten in enumerate(self.unwritten) if unwritten is snapshot
+                ))
+
+    def write_snapshot(self, snapshot: 'Project', full: bool):
+        file = snapshot.file
+        if snapshot.format == 'sqlite':
+            from editor_types.stubs import sqlite_row_ids
+            from sqlite_store import SqliteStore
+
+            if full or self.store is None or self.store.path != file or not file.exists():
+                if self.store is None or self.store.path != file:
+                    self.store = SqliteStore(file)
+
+                # stubs read from the database keep their rows, so they still decode their item
+                row_ids = sqlite_row_ids(snapshot.content, self.store)
+                self.store.write(snapshot.to_json(), row_ids)
+            elif snapshot.changes:
+                self.store.apply(snapshot.encode_changes())
+
+            return
+
+        if (
+            full or self.base is None or not file.exists() or
+            self.journaled + len(snapshot.changes) > JOURNAL_LIMIT
+        ):
+            json = snapshot.to_json()
+            if snapshot.format == 'binary':
+                data = encode(json)
+            else:
+                data = dumps(json, indent=4).encode('utf-8')
+
+            write_atomic(file, data)
+            journal_file(file).unlink(missing_ok=True)
+
+            self.base = base_hash(data)
+            self.journaled = 0
+            return
+        elif not snapshot.changes:
+            return
+
+        if self.journaled == 0:
+            start_journal(file, self.base)
+
+        entries = snapshot.encode_changes()
+        append_journal(file, entries)
+        self.journaled += len(entries)
+
+    def encode_changes(self):
+        from editor_types.codec import encode_content
+
+        entries = []
+        for op, index, content in self.changes:
+            entry: dict[str, Any] = {'op': op, 'index': index}
+            if content is not None:
+                entry['content'] = encode_content(content)
+
+            entries.append(entry)
+
+        return entries
+
+    def __getstate__(self):
+        # copies sent to other processes only build the project, they never save it
+        state = self.__dict__.copy()
+        for name in ('changes', 'base', 'journaled', 'store', 'unwritten', 'save_lock'):
+            state.pop(name, None)
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.changes = []
+        self.base = None
+        self.journaled = 0
+        self.store = None
+        self.unwritten = []
+        self.save_lock = Lock()
+
+def read_project_json(path: Path):
+    """The json of the project at `path`, whatever its format, with its journal applied."""
+
+    from sqlite_store import SqliteStore, is_sqlite
+
+    if is_sqlite(path):
+        return SqliteStore(path).read()
+
+    data = path.read_bytes()
+    json = load_json(data)
+    entries, _ = read_journal(path, base_hash(data))
+    replay(json['content'], entries, lambda content: content)
+    return json
+
+def convert(path: Path, format: str):
+    """Write the project at `path` in another format next to it, leaving the original alone.
+Returns the path of the converted project."""
+
+    from sqlite_store import SqliteStore
+
+    json = read_project_json(path)
+    converted = path.with_suffix(FORMAT_SUFFIXES[format])
+    if format == 'sqlite':
+        converted.unlink(missing_ok=True)
+        SqliteStore(converted).write(json)
+    elif format == 'binary':
+        write_atomic(converted, encode(json))
+    else:
+        write_atomic(converted, dumps(json, indent=4).encode('utf-8'))
+
+    return converted
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, asdict
+from json import loads, dumps
+from threading import Lock
+from pathlib import Path
+from typing import Any
+
+from journal import journal_file, write_atomic
+from project import Project
+
+
+index_file = Path.cwd() / 'cache' / 'project_index.json'
+
+def file_stamp(path: Path) -> list[int] | None:
+    """The size and modification time of a file, `None` if it does not exist."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+@dataclass
+class ProjectSummary:
+    """What the project manager shows of a project, kept in the project index so projects are only
+loaded when they are opened. `stamp` and `journal_stamp` are the `file_stamp`s of the project file
+and its journal when this was read from them, and `report_stamp` that of its last build report."""
+
+    file: Path
+    name: str
+    content_count: int
+    stamp: list[int] | None
+    journal_stamp: list[int] | None
+    # 'built', 'up to date', 'failed' or 'cancelled', `None` if never built
+    build_status: str | None = None
+    built: float | None = None # when the last build started
+    report_stamp: list[int] | None = None
+
+    @property
+    def path(self):
+        return self.file.parent
+
+    @property
+    def report_file(self):
+        # as named by `build_project`
+        mod_name = self.name.replace(' ', '_')
+        return self.path / f'{mod_name}.report.json'
+
+    def is_fresh(self):
+        return (
+            self.stamp == file_stamp(self.file) and
+            self.journal_stamp == file_stamp(journal_file(self.file))
+        )
+
+    def read_report(self):
+        self.report_stamp = file_stamp(self.report_file)
+        self.build_status = self.built = None
+        if self.report_stamp is None:
+            return
+
+        try:
+            report = loads(self.report_file.read_bytes())
+        except ValueError:
+            return
+
+        self.built = report.get('started')
+        if report.get('cancelled'):
+            self.build_status = 'cancelled'
+        elif report.get('up_to_date'):
+            self.build_status = 'up to date'
+        else:
+            self.build_status = 'built' if report.get('success') else 'failed'
+
+    def load(self, lazy: bool = True):
+        """Load the whole project, lazily by default (see `Project.load`)."""
+
+        return Project.load(self.file, lazy)
+
+    @staticmethod
+    def read(file: Path):
+        """Summarize a project by loading it."""
+
+        # stamped first, so a save made while it is being read invalidates the summary
+        stamp = file_stamp(file)
+        journal_stamp = file_stamp(journal_file(file))
+        project = Project.load(file, lazy=True)
+        summary = ProjectSummary(file, project.name, len(project.content), stamp, journal_stamp)
+        summary.read_report()
+        return summary
+
+    def to_json(self):
+        json = asdict(self)
+        json['file'] = self.file.as_posix()
+        return json
+
+    @staticmethod
+    def from_json(json: dict[str, Any]):
+        return ProjectSummary(**json | {'file': Path(json['file'])})
+
+class ProjectIndex:
+    """A cache of `ProjectSummary`s, saved across runs. A summary is used as long as the project
+file and its journal have the same size and modification time as when it was made, otherwise the
+project is loaded again to update it. It can be used from several threads."""
+
+    def __init__(self, path: Path = index_file):
+        self.path = path
+        self.lock = Lock()
+        self.summaries: dict[str, ProjectSummary] = {}
+        try:
+            json = loads(path.read_bytes())
+            for summary_json in json:
+                summary = ProjectSummary.from_json(summary_json)
+                self.summaries[summary.file.as_posix()] = summary
+        except (OSError, ValueError, TypeError, KeyError):
+            # a missing or broken index only means every project is read again
+            self.summaries.clear()
+
+    def summary(self, file: Path):
+        key = file.as_posix()
+        with self.lock:
+            summary = self.summaries.get(key)
+
+        if summary is None or not summary.is_fresh():
+            summary = ProjectSummary.read(file)
+            with self.lock:
+                self.summaries[key] = summary
+        elif summary.report_stamp != file_stamp(summary.report_file):
+            summary.read_report()
+
+        return summary
+
+    def save(self, files: list[Path] | None = None):
+        """Save the summaries of `files` (every summary if `None`), dropping the rest."""
+
+        with self.lock:
+            if files is not None:
+                keys = {file.as_posix() for file in files}
+                self.summaries = {
+                    key: summary for key, summary in self.summaries.items() if key in keys
+                }
+
+            json = [summary.to_json() for summary in self.summaries.values()]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, dumps(json, indent=4).encode('utf-8'))
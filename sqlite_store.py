@@ -0,0 +1,281 @@
+from sqlite3 import connect, Connection
+from contextlib import contextmanager
+from threading import local
+from json import loads, dumps
+from pathlib import Path
+from typing import Any
+
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS project (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS content (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT,
+    internal_name TEXT,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS content_position ON content (position);
+CREATE INDEX IF NOT EXISTS content_type ON content (type);
+CREATE INDEX IF NOT EXISTS content_internal_name ON content (internal_name);
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+def is_sqlite(path: Path):
+    with path.open('rb') as f:
+        return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+
+def content_name(json: dict[str, Any]) -> str | None:
+    name = json.get('name')
+    value = name.get('value') if isinstance(name, dict) else None
+    return value if isinstance(value, str) else None
+
+def content_internal_name(json: dict[str, Any]):
+    """The internal name of a content item from its json, like `ContentType.get_internal_name`."""
+
+    name = content_name(json)
+    return name.replace(' ', '') if name is not None else None
+
+class SqliteStore:
+    """Keeps a project in a SQLite database: one row per content item, indexed by type and
+internal name, with the images they use stored once per path in an assets table along with their
+content hash. Content is read and written as the json `Project.save` makes. Each thread gets its own
+connection, so a store can be used from any thread."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.connections = local()
+        # ids of the content rows in project order, as last read or written by this store
+        self.row_ids: list[int] = []
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self):
+        db = getattr(self.connections, 'db', None)
+        if db is None:
+            db = self.connections.db = connect(self.path)
+
+        with db: # one transaction, committed on success and rolled back on error
+            yield db
+
+    def add_assets(self, db: Connection, json: dict[str, Any], used: set[int]):
+        """Replace the image paths in a content item's json with the id of the image in the assets
+table, adding or updating it there and adding the id to `used`. Images that do not exist keep their
+path."""
+
+        from builder.textures import file_stamp, hash_texture
+
+        stored = dict(json)
+        for name, field_json in json.items():
+            if not isinstance(field_json, dict) or field_json.get('type') != 'Image':
+                continue
+
+            path = Path(field_json['path'])
+            if not path.is_file():
+                continue
+
+            stamp = file_stamp(path)
+            digest = hash_texture(path, stamp)
+            asset_id, = db.execute(
+                'INSERT INTO assets (path, hash, size, mtime_ns) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (path) DO UPDATE SET '
+                'hash = excluded.hash, size = excluded.size, mtime_ns = excluded.mtime_ns '
+                'RETURNING id', (path.as_posix(), digest, stamp[0], stamp[1])
+            ).fetchone()
+            stored[name] = {'type': 'Image', 'asset': asset_id}
+            used.add(asset_id)
+
+        return stored
+
+    def resolve_assets(self, json: dict[str, Any], assets: dict[int, str]):
+        for name, field_json in json.items():
+            if isinstance(field_json, dict) and 'asset' in field_json:
+                json[name] = {'type': field_json['type'], 'path': assets[field_json['asset']]}
+
+        return json
+
+    def assets(self, db: Connection):
+        return dict(db.execute('SELECT id, path FROM assets'))
+
+    def content_row(self, db: Connection, json: dict[str, Any], used: set[int] | None = None):
+        stored = self.add_assets(db, json, set() if used is None else used)
+        return (
+            json['type'], content_name(json), content_internal_name(json),
+            dumps(stored, separators=(',', ':'))
+        )
+
+    def insert_content(self, db: Connection, position: int, row: tuple):
+        cursor = db.execute(
+            'INSERT INTO content (position, type, name, internal_name, json) '
+            'VALUES (?, ?, ?, ?, ?)', (position, *row)
+        )
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def write(self, json: dict[str, Any], row_ids: list[int | None] | None = None):
+        """Replace everything in the database with this project, in one transaction. `row_ids` are
+the rows items already have in the database, `None` for new items: those rows keep their ids, so
+stubs of them stay valid, and every other row is deleted."""
+
+        kept: dict[int, None] = {}
+        for row_id in row_ids or []:
+            if row_id is not None:
+                kept.setdefault(row_id)
+
+        with self.connect() as db:
+            stale = {row_id for row_id, in db.execute('SELECT id FROM content')} - kept.keys()
+            db.executemany('DELETE FROM content WHERE id = ?', [(row_id,) for row_id in stale])
+            db.execute('DELETE FROM project')
+            project = {key: value for key, value in json.items() if key != 'content'}
+            db.executemany('INSERT INTO project VALUES (?, ?)', [
+                ('version', dumps(SCHEMA_VERSION)),
+                *((key, dumps(value)) for key, value in project.items())
+            ])
+
+            used: set[int] = set()
+            self.row_ids = []
+            for position, content in enumerate(json['content']):
+                row = self.content_row(db, content, used)
+                row_id = row_ids[position] if row_ids is not None else None
+                if row_id in kept:
+                    # each kept row is used once, by the first item it was given for
+                    del kept[row_id]
+                    db.execute(
+                        'UPDATE content SET position = ?, type = ?, name = ?, internal_name = ?, '
+                        'json = ? WHERE id = ?', (position, *row, row_id)
+                    )
+                else:
+                    row_id = self.insert_content(db, position, row)
+
+                self.row_ids.append(row_id)
+
+            # images no content uses anymore, saving single items leaves them until the next write
+            unused = {asset_id for asset_id, in db.execute('SELECT id FROM assets')} - used
+            db.executemany('DELETE FROM assets WHERE id = ?', [(asset_id,) for asset_id in unused])
+
+    def read_project(self, db: Connection):
+        json = {key: loads(value) for key, value in db.execute('SELECT key, value FROM project')}
+        version = json.pop('version', None)
+        if version is None or version > SCHEMA_VERSION:
+            raise ValueError(f'{self.path.as_posix()} is not a tModBuilder project database')
+
+        return json
+
+    def read(self):
+        """The whole project as json, like `Project.save` writes it."""
+
+        with self.connect() as db:
+            json = self.read_project(db)
+            assets = self.assets(db)
+            rows = db.execute('SELECT id, json FROM content ORDER BY position').fetchall()
+
+        self.row_ids = [row_id for row_id, _ in rows]
+        json['content'] = [self.resolve_assets(loads(content), assets) for _, content in rows]
+        return json
+
+    def read_names(self):
+        """The project as json, with `(row id, type, name)` in place of each content item."""
+
+        with self.connect() as db:
+            json = self.read_project(db)
+            rows = db.execute('SELECT id, type, name FROM content ORDER BY position').fetchall()
+
+        self.row_ids = [row_id for row_id, _, _ in rows]
+        json['content'] = rows
+        return json
+
+    def read_content(self, row_id: int) -> dict[str, Any]:
+        with self.connect() as db:
+            row = db.execute('SELECT json FROM content WHERE id = ?', (row_id,)).fetchone()
+            if row is None:
+                raise KeyError(row_id)
+
+            json = loads(row[0])
+            asset_ids = [
+                field_json['asset'] for field_json in json.values()
+                if isinstance(field_json, dict) and 'asset' in field_json
+            ]
+            placeholders = ', '.join('?' * len(asset_ids))
+            assets = dict(db.execute(
+                f'SELECT id, path FROM assets WHERE id IN ({placeholders})', asset_ids
+            ))
+
+        return self.resolve_assets(json, assets)
+
+    def apply(self, entries: list[dict[str, Any]]):
+        """Save journal entries (see `journal`), each one in its own transaction."""
+
+        for entry in entries:
+            index = entry['index']
+            with self.connect() as db:
+                match entry['op']:
+                    case 'set':
+                        row = self.content_row(db, entry['content'])
+                        db.execute(
+                            'UPDATE content SET type = ?, name = ?, internal_name = ?, json = ? '
+                            'WHERE id = ?', (*row, self.row_ids[index])
+                        )
+                    case 'insert':
+                        # make room, so positions stay unique and in project order
+                        position = index
+                        if index < len(self.row_ids):
+                            position, = db.execute(
+                                'SELECT position FROM content WHERE id = ?', (self.row_ids[index],)
+                            ).fetchone()
+                            db.execute(
+                                'UPDATE content SET position = position + 1 WHERE position >= ?',
+                                (position,)
+                            )
+                        elif self.row_ids:
+                            last, = db.execute('SELECT MAX(position) FROM content').fetchone()
+                            position = last + 1
+
+                        row = self.content_row(db, entry['content'])
+                        self.row_ids.insert(index, self.insert_content(db, position, row))
+                    case 'remove':
+                        db.execute('DELETE FROM content WHERE id = ?', (self.row_ids.pop(index),))
+                    case op:
+                        raise ValueError(f'Unknown journal operation: {op}')
+
+    def query(
+        self, content_type: str | None = None, *, internal_name: str | None = None, **where: Any
+    ):
+        """The `(row id, json)` of the saved content of `content_type` (any type if `None`) whose
+fields have these values, without reading the rest of the project. Keywords are paths into the
+content's json with dots replaced by double underscores, e.g. `rarity__rare='Red'`, and
+`internal_name` only matches the content with that internal name."""
+
+        conditions = []
+        params: list[Any] = []
+        if content_type is not None:
+            conditions.append('type = ?')
+            params.append(content_type)
+
+        if internal_name is not None:
+            conditions.append('internal_name = ?')
+            params.append(internal_name)
+
+        for path, value in where.items():
+            conditions.append('json_extract(json, ?) = ?')
+            params += ['$.' + path.replace('__', '.'), value]
+
+        sql = 'SELECT id, json FROM content'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+
+        with self.connect() as db:
+            assets = self.assets(db)
+            rows = db.execute(sql + ' ORDER BY position', params).fetchall()
+
+        return [(row_id, self.resolve_assets(loads(json), assets)) for row_id, json in rows]
@@ -0,0 +1,20 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+# the app is run from the repository root, so its modules are imported from there
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# content types import the project module back, so it has to be imported first
+import project # noqa: E402
+from benchmarks import make_project # noqa: E402
+
+
+@pytest.fixture
+def mod_project(tmp_path: Path):
+    """A saved json project with a few items of every content type."""
+
+    mod_project = make_project(tmp_path, 12)
+    mod_project.save()
+    return mod_project
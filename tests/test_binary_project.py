@@ -0,0 +1,36 @@
+from binary_project import decode, encode, is_binary
+from project import Project, convert, read_project_json
+
+
+def test_json_round_trip(mod_project):
+    json = mod_project.to_json()
+    # strings, big ints, lists and a field missing keys are all kept as they were
+    json['content'].append(json['content'][0] | {'extra': {'type': 'Tags', 'tags': ['a', 'b']}})
+    json['content'].append(json['content'][0] | {'value': {'type': 'CoinValue', 'gold': 2 ** 70}})
+    # not shaped like a saved item, so stored as raw json
+    json['content'].append({'type': 'Sword', 'name': 'not a field'})
+    json['content'].append([1, 2, 3])
+
+    data = encode(json)
+    assert is_binary(data)
+    assert decode(data) == json
+
+def test_save_and_load(mod_project):
+    mod_project.format = 'binary'
+    mod_project.save()
+
+    data = mod_project.file.read_bytes()
+    assert is_binary(data) and mod_project.file.suffix == '.tmb'
+    assert Project.load(mod_project.file).content == mod_project.content
+
+    lazy = Project.load(mod_project.file, lazy=True)
+    lazy.materialize_all()
+    assert lazy.content == mod_project.content
+
+def test_convert_keeps_the_project(mod_project):
+    json = read_project_json(mod_project.file)
+    binary = convert(mod_project.file, 'binary')
+    assert read_project_json(binary) == json
+
+    assert convert(binary, 'json') == mod_project.file
+    assert read_project_json(mod_project.file) == json
@@ -0,0 +1,139 @@
+from dataclasses import replace
+from shutil import rmtree
+
+import pytest
+
+from builder import build_project, content_sources, BuildManifest
+from editor_types.data_types import CoinValue, Int
+from builder.compilers import FakeCompiler
+from builder.report import BuildMonitor
+
+
+class CountingCompiler(FakeCompiler):
+    def __init__(self):
+        super().__init__()
+        self.restores: list[bool] = []
+
+    def compile(self, csproj, restore, monitor=None):
+        self.restores.append(restore)
+        return super().compile(csproj, restore, monitor)
+
+def content_file(mod_project, index: int):
+    internal_name = mod_project.content[index].get_internal_name()
+    return mod_project.path / mod_project.internal_name / 'Content' / f'{internal_name}.cs'
+
+def test_unchanged_projects_are_up_to_date(mod_project):
+    compiler = CountingCompiler()
+    first = build_project(mod_project, compiler=compiler)
+    assert first.success and not first.up_to_date
+
+    second = build_project(mod_project, compiler=compiler)
+    assert second.success and second.up_to_date
+    assert len(compiler.restores) == 1
+
+def test_an_edit_only_rewrites_its_item(mod_project):
+    compiler = CountingCompiler()
+    build_project(mod_project, compiler=compiler)
+    untouched = content_file(mod_project, 1).stat().st_mtime_ns
+
+    mod_project.set_content(0, replace(mod_project.content[0], value=CoinValue(9, 9, 9, 9)))
+    report = build_project(mod_project, compiler=compiler)
+    assert report.success and not report.up_to_date
+    assert report.stages['codegen'].files_touched == 1
+    assert report.stages['scaffolding'].files_touched == 0
+    assert content_file(mod_project, 1).stat().st_mtime_ns == untouched
+    # the .csproj did not change, so packages are not restored again
+    assert compiler.restores == [True, False]
+
+def test_process_workers_only_get_their_items_images(mod_project):
+    compiler = CountingCompiler()
+    build_project(mod_project, jobs=2, processes=True, compiler=compiler)
+    previous = BuildManifest.load(mod_project.path / f'{mod_project.internal_name}.manifest')
+    for content in mod_project.content:
+        texture = content.texture.path
+        assert content_sources(previous, content) == {texture: previous.sources[texture]}
+
+    mod_project.set_content(0, replace(mod_project.content[0], value=CoinValue(9, 9, 9, 9)))
+    report = build_project(mod_project, jobs=2, processes=True, compiler=compiler)
+    assert report.stages['codegen'].files_touched == 1
+    assert report.stages['textures'].files_touched == 0
+
+def test_removed_items_are_deleted(mod_project):
+    build_project(mod_project, compiler=FakeCompiler())
+    removed = content_file(mod_project, 3)
+    assert removed.exists()
+
+    mod_project.remove_content(3)
+    assert build_project(mod_project, compiler=FakeCompiler()).success
+    assert not removed.exists()
+
+def test_another_compiler_compiles_again(mod_project):
+    build_project(mod_project, compiler=FakeCompiler())
+
+    class OtherCompiler(FakeCompiler):
+        name = 'other'
+
+    report = build_project(mod_project, compiler=OtherCompiler())
+    assert report.success and not report.up_to_date
+    manifest = BuildManifest.load(mod_project.path / f'{mod_project.internal_name}.manifest')
+    assert manifest.compiler == 'other' and manifest.compiled
+
+def test_cancelled_builds_are_not_trusted(mod_project):
+    build_project(mod_project, compiler=FakeCompiler())
+    sword = mod_project.content[2]
+    sword_file = content_file(mod_project, 2)
+    original = sword_file.read_text('utf-8')
+
+    # the edited item is written before the build is cancelled
+    mod_project.set_content(2, replace(sword, damage=Int(112)))
+    monitor = BuildMonitor()
+    monitor.progress = lambda stage: monitor.cancel() if stage == 'localization' else None
+    assert build_project(mod_project, compiler=FakeCompiler(), monitor=monitor).cancelled
+    assert sword_file.read_text('utf-8') != original
+
+    mod_project.set_content(2, sword)
+    report = build_project(mod_project, compiler=FakeCompiler())
+    assert report.success and not report.up_to_date
+    assert sword_file.read_text('utf-8') == original
+
+def test_failed_builds_are_not_trusted(mod_project):
+    class BrokenCompiler(FakeCompiler):
+        def compile(self, csproj, restore, monitor=None):
+            raise RuntimeError('msbuild crashed')
+
+    build_project(mod_project, compiler=FakeCompiler())
+    sword = mod_project.content[2]
+    mod_project.set_content(2, replace(sword, damage=Int(112)))
+    with pytest.raises(RuntimeError):
+        build_project(mod_project, compiler=BrokenCompiler())
+
+    mod_project.set_content(2, sword)
+    assert not build_project(mod_project, compiler=FakeCompiler()).up_to_date
+    assert 'SetWeaponValues(112' not in content_file(mod_project, 2).read_text('utf-8')
+
+def test_missing_packages_are_restored_again(mod_project):
+    compiler = CountingCompiler()
+    build_project(mod_project, compiler=compiler)
+    rmtree(mod_project.path / mod_project.internal_name / 'obj')
+
+    mod_project.set_content(0, replace(mod_project.content[0], value=CoinValue(9, 9, 9, 9)))
+    assert build_project(mod_project, compiler=compiler).success
+    assert compiler.restores == [True, True]
+
+def test_failed_compiles_restore_again(mod_project):
+    class FailingCompiler(CountingCompiler):
+        def compile(self, csproj, restore, monitor=None):
+            result = super().compile(csproj, restore, monitor)
+            return replace(result, success=False)
+
+    compiler = CountingCompiler()
+    build_project(mod_project, compiler=compiler)
+
+    mod_project.set_content(0, replace(mod_project.content[0], value=CoinValue(9, 9, 9, 9)))
+    failing = FailingCompiler()
+    assert not build_project(mod_project, compiler=failing).success
+    assert failing.restores == [False]
+
+    mod_project.set_content(0, replace(mod_project.content[0], value=CoinValue(1, 1, 1, 1)))
+    assert build_project(mod_project, compiler=compiler).success
+    assert compiler.restores == [True, True]
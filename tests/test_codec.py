@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from copy import deepcopy
+
+import pytest
+
+from editor_types.codec import Registry, DataTypeCodec, data_types, decode_content, encode_content
+from editor_types.data_types import CoinValue, Int
+from editor_types.content_types import Sword
+
+
+def test_content_round_trip(mod_project):
+    for content in mod_project.content:
+        assert decode_content(encode_content(content)) == content
+
+def test_decode_leaves_json_unchanged(mod_project):
+    json = mod_project.to_json()['content']
+    copy = deepcopy(json)
+    for content_json in json:
+        decode_content(content_json)
+
+    assert json == copy
+
+def test_unknown_types_are_skipped():
+    assert decode_content({'type': 'Spaceship'}) is None
+
+    json = encode_content(Sword(damage=Int(7)))
+    json['knockback'] = {'type': 'Vector', 'x': 1}
+    assert decode_content(json) == Sword(damage=Int(7))
+
+def test_content_without_a_type_is_rejected():
+    with pytest.raises(ValueError):
+        decode_content({'name': {'type': 'String', 'value': 'Sword'}})
+
+def test_missing_fields_take_their_defaults():
+    # saved before copper existed
+    codec = data_types.find('CoinValue')
+    assert codec is not None
+    assert codec.decode({'type': 'CoinValue', 'platinum': 1, 'gold': 2, 'silver': 3}) == (
+        CoinValue(1, 2, 3)
+    )
+
+def test_registry_finds_types_added_later():
+    @dataclass
+    class Percent(Int):
+        pass
+
+    types: list[type] = [Int]
+    registry = Registry[DataTypeCodec](types, DataTypeCodec.compile)
+    assert registry.find('Percent') is None
+
+    types.append(Percent)
+    codec = registry.find('Percent')
+    assert codec is not None and codec.decode({'type': 'Percent', 'value': 5}) == Percent(5)
+    assert registry.of(Percent) is codec
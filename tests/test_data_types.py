@@ -0,0 +1,73 @@
+from dataclasses import fields
+
+from editor_types.data_types import (
+    Int, Float, String, Bool, Image, Rarity, CoinValue, DamageBoost, DataType
+)
+
+
+class FakeEntry:
+    def __init__(self):
+        self.text = ''
+
+    def delete(self, first, last):
+        self.text = ''
+
+    def insert(self, index, value):
+        self.text = str(value) # like tkinter, which shows everything as text
+
+    def get(self):
+        return self.text
+
+class FakeCheckBox:
+    def __init__(self):
+        self.checked = 0
+
+    def select(self):
+        self.checked = 1
+
+    def deselect(self):
+        self.checked = 0
+
+    def get(self):
+        return self.checked
+
+    def configure(self, **kwargs):
+        pass
+
+class FakeButton:
+    def __init__(self):
+        self.text = ''
+
+    def configure(self, text='', **kwargs):
+        self.text = text
+
+    def cget(self, name):
+        return self.text
+
+    def update_button(self):
+        pass
+
+FAKE_WIDGETS = {
+    Int: FakeEntry, Float: FakeEntry, String: FakeEntry, Bool: FakeCheckBox, Image: FakeButton,
+    Rarity: FakeButton, CoinValue: lambda: [FakeEntry() for _ in range(4)],
+    DamageBoost: lambda: [FakeButton(), FakeEntry()]
+}
+
+def shown(value: DataType):
+    """The value read back from widgets showing it, like an unedited properties form."""
+
+    widgets = FAKE_WIDGETS[type(value)]()
+    assert value.rebind(widgets)
+    return value.read(widgets)
+
+def test_unedited_forms_read_the_same_content(mod_project):
+    for content in mod_project.content:
+        read = {field.name: shown(getattr(content, field.name)) for field in fields(content)}
+        assert content.__class__(**read) == content
+
+def test_unedited_values_read_the_same_value():
+    for value in (
+        CoinValue(1, 2, 3, 4), DamageBoost('Magic', 0.5), Bool(True), Rarity('Master'),
+        Float(2.5)
+    ):
+        assert shown(value) == value
@@ -0,0 +1,67 @@
+from dataclasses import replace
+
+from editor_types.data_types import Int, String
+from editor_types.content_types import Sword
+from history import History, Step
+from project import Project
+
+
+def test_undo_and_redo_every_edit(mod_project):
+    original = list(mod_project.content)
+    history = History(mod_project)
+    history.set_content(2, replace(mod_project.content[2], damage=Int(99)))
+    history.add_content(Sword(name=String('Added')))
+    history.remove_content(0)
+    history.set_content(0, mod_project.content[1]) # replaced by an item of another type
+    edited = list(mod_project.content)
+
+    while history.can_undo:
+        history.undo()
+
+    assert mod_project.content == original
+    assert not history.can_undo and history.undo() is None
+
+    while history.can_redo:
+        history.redo()
+
+    assert mod_project.content == edited
+
+def test_steps_keep_only_changed_fields(mod_project):
+    history = History(mod_project)
+    sword = mod_project.content[2]
+    history.set_content(2, replace(sword, damage=Int(99)))
+    assert history.undos[-1] == Step('set', 2, {'damage': sword.damage}, {'damage': Int(99)})
+
+    # nothing changed, so there is nothing to undo
+    history.set_content(2, replace(mod_project.content[2]))
+    assert len(history.undos) == 1
+
+def test_a_new_edit_clears_redo(mod_project):
+    history = History(mod_project)
+    history.remove_content(0)
+    history.undo()
+    assert history.can_redo
+
+    history.remove_content(1)
+    assert not history.can_redo
+
+def test_undone_edits_are_saved(mod_project):
+    history = History(mod_project)
+    history.set_content(0, replace(mod_project.content[0], name=String('Renamed')))
+    history.remove_content(3)
+    history.undo()
+    history.undo()
+    mod_project.save_changes()
+
+    assert Project.load(mod_project.file).content == mod_project.content
+
+def test_history_limit(mod_project):
+    history = History(mod_project, limit=3)
+    for damage in range(5):
+        history.set_content(2, replace(mod_project.content[2], damage=Int(damage)))
+
+    assert len(history.undos) == 3
+    while history.can_undo:
+        history.undo()
+
+    assert mod_project.content[2].damage == Int(1)
@@ -0,0 +1,85 @@
+from dataclasses import replace
+
+import pytest
+
+from journal import journal_file, read_journal, start_journal, append_journal, base_hash
+from editor_types.data_types import String
+from project import Project
+import project
+
+
+def edit(mod_project: Project):
+    first = mod_project.get_content(0)
+    mod_project.set_content(0, replace(first, name=String('Renamed')))
+    mod_project.insert_content(1, replace(first, name=String('Inserted')))
+    mod_project.remove_content(5)
+    mod_project.add_content(mod_project.get_content(2))
+
+@pytest.mark.parametrize('format', ['json', 'binary'])
+def test_changes_are_journaled_and_replayed(mod_project, format):
+    mod_project.format = format
+    mod_project.save()
+    saved = mod_project.file.read_bytes()
+
+    edit(mod_project)
+    mod_project.save_changes()
+    assert mod_project.file.read_bytes() == saved
+    entries, complete = read_journal(mod_project.file, base_hash(saved))
+    assert len(entries) == 4 and complete
+
+    assert Project.load(mod_project.file).content == mod_project.content
+    lazy = Project.load(mod_project.file, lazy=True)
+    lazy.materialize_all()
+    assert lazy.content == mod_project.content
+
+def test_journaling_continues_after_loading(mod_project):
+    edit(mod_project)
+    mod_project.save_changes()
+
+    loaded = Project.load(mod_project.file)
+    edit(loaded)
+    loaded.save_changes()
+    assert Project.load(mod_project.file).content == loaded.content
+
+def test_full_save_replaces_the_journal(mod_project):
+    edit(mod_project)
+    mod_project.save_changes()
+    mod_project.save()
+
+    assert not journal_file(mod_project.file).exists()
+    assert Project.load(mod_project.file).content == mod_project.content
+
+def test_long_journals_are_compacted(mod_project, monkeypatch):
+    monkeypatch.setattr(project, 'JOURNAL_LIMIT', 6)
+    edit(mod_project)
+    mod_project.save_changes()
+    assert journal_file(mod_project.file).exists()
+
+    edit(mod_project)
+    mod_project.save_changes()
+    assert not journal_file(mod_project.file).exists()
+    assert Project.load(mod_project.file).content == mod_project.content
+
+def test_stale_and_torn_journals(tmp_path):
+    file = tmp_path / 'Mod.json'
+    start_journal(file, 'old')
+    append_journal(file, [{'op': 'remove', 'index': 0}])
+    assert read_journal(file, 'new') == ([], True)
+
+    with journal_file(file).open('a', encoding='utf-8') as f:
+        f.write('{"op": "remo') # cut short by a crash
+
+    assert read_journal(file, 'old') == ([{'op': 'remove', 'index': 0}], False)
+
+def test_saving_after_a_torn_journal(mod_project):
+    edit(mod_project)
+    mod_project.save_changes()
+    with journal_file(mod_project.file).open('a', encoding='utf-8') as f:
+        f.write('{"op": "remo') # cut short by a crash
+
+    loaded = Project.load(mod_project.file)
+    assert loaded.content == mod_project.content
+
+    loaded.set_content(1, replace(loaded.get_content(1), name=String('B')))
+    loaded.save_changes()
+    assert Project.load(mod_project.file).content == loaded.content
@@ -0,0 +1,75 @@
+from dataclasses import replace
+from shutil import copy
+
+from editor_types.data_types import Image, Int, String
+from project import Project, convert
+
+
+def test_save_and_load(mod_project):
+    mod_project.format = 'sqlite'
+    mod_project.save()
+
+    assert Project.load(mod_project.file).content == mod_project.content
+    lazy = Project.load(mod_project.file, lazy=True)
+    lazy.materialize_all()
+    assert lazy.content == mod_project.content
+
+def test_changes_are_saved_per_item(mod_project):
+    mod_project.format = 'sqlite'
+    mod_project.save()
+
+    first = mod_project.get_content(0)
+    mod_project.set_content(2, replace(mod_project.get_content(2), name=String('Renamed')))
+    mod_project.insert_content(1, replace(first, name=String('Inserted')))
+    mod_project.remove_content(0)
+    mod_project.add_content(first)
+    mod_project.save_changes()
+
+    assert Project.load(mod_project.file).content == mod_project.content
+
+def test_query(mod_project):
+    swords = [
+        (i, content) for i, content in enumerate(mod_project.content)
+        if content.__class__.__name__ == 'Sword' and content.crit_chance == Int(6)
+    ]
+    assert swords
+    assert mod_project.query('Sword', crit_chance__value=6) == swords
+
+    name = mod_project.content[5].get_internal_name()
+    assert mod_project.query(internal_name=name) == [(5, mod_project.content[5])]
+
+    database = Project.load(convert(mod_project.file, 'sqlite'), lazy=True)
+    assert database.query('Sword', crit_chance__value=6) == swords
+    assert database.query(internal_name=name) == [(5, mod_project.content[5])]
+
+def test_images_are_kept_per_path(mod_project, tmp_path):
+    # the same bytes under another path
+    texture = mod_project.content[0].texture.path
+    copied = tmp_path / 'copy.png'
+    copy(texture, copied)
+    mod_project.content[1] = replace(mod_project.content[1], texture=Image(copied.as_posix()))
+    mod_project.format = 'sqlite'
+    mod_project.save()
+
+    loaded = Project.load(mod_project.file)
+    assert loaded.content[0].texture.path == texture
+    assert loaded.content[1].texture.path == copied.as_posix()
+
+def test_stubs_survive_a_full_save(mod_project):
+    mod_project.format = 'sqlite'
+    mod_project.save()
+
+    lazy = Project.load(mod_project.file, lazy=True)
+    lazy.remove_content(0)
+    lazy.save_changes()
+    lazy.save()
+    # a failed save forgets the store, so the next full save starts from a new one
+    lazy.store = None
+    lazy.set_content(0, replace(lazy.get_content(0), name=String('Renamed')))
+    lazy.save()
+
+    expected = mod_project.content[1:]
+    expected[0] = replace(expected[0], name=String('Renamed'))
+    lazy.materialize_all()
+    assert lazy.content == expected
+    assert Project.load(mod_project.file).content == expected